@@ -0,0 +1,480 @@
+""" Throughput benchmarks of the scraper, against a local synthetic catalog
+
+Usage:
+    python benchmarks/run_benchmarks.py --businesses 500 --per-page 10
+    python benchmarks/run_benchmarks.py --stages listing,contacts --output results.json
+
+Each stage runs in its own process, so its peak memory is measured alone.
+Results are saved as json, to compare runs.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import platform
+import importlib
+import multiprocessing
+from functools import partial
+
+current_folder = os.path.dirname(os.path.abspath(__file__))
+project_folder = os.path.dirname(current_folder)
+sys.path.insert(0, project_folder)
+
+from libs.page_archive import PageArchive
+from libs.replay_server import ReplayServer
+from libs.http_fetch import HttpFetcher, parse_anchors, parse_listing
+from libs.contact_extractor import extract_contacts
+from libs.contact_resolver import ContactResolver
+from libs.subpage_crawler import SubpageCrawler
+from libs.stream_writer import StreamWriter
+from libs.xlsx import SpreadsheetManager
+
+STAGES = ("listing", "contacts", "spreadsheet", "stream", "autorun")
+CATALOG_HOST = "www.acelerapyme.gob.es"
+CATALOG_PATH = "/kit-consulting/catalogo-asesores"
+HEADER = ["name", "links", "province", "solution", "cnae", "emails", "phones"]
+
+
+def get_peak_rss() -> int:
+    """ Return the max memory used by the current process
+
+    Returns:
+        int: peak resident memory in bytes, or None if it is not available
+    """
+
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset
+        except (ImportError, AttributeError):
+            return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_percentile(values: list, percent: float) -> float:
+    """ Return a percentile of a list of values (nearest rank)
+
+    Args:
+        values (list): values to measure
+        percent (float): percentile, from 0 to 100
+
+    Returns:
+        float: value of the percentile, or None if there are no values
+    """
+
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def build_catalog(archive_path: str, businesses: int, per_page: int, seed: int = 1):
+    """ Create an archive with a synthetic catalog: listing pages with pager
+        and business sites, some of them with the contact info in a subpage
+
+    Args:
+        archive_path (str): path of the archive to create
+        businesses (int): number of businesses
+        per_page (int): businesses by listing page
+        seed (int, optional): random seed, to build the same catalog. Defaults to 1.
+    """
+
+    randomizer = random.Random(seed)
+    archive = PageArchive(archive_path, load=False)
+    pages = max(1, -(-businesses // per_page))
+
+    for page in range(pages):
+        rows = []
+        for index in range(page * per_page, min(businesses, (page + 1) * per_page)):
+            rows.append(f"""
+                <div class="views-row">
+                    <h2>Business {index}</h2>
+                    <a href="https://www.business-{index}.es/">Web</a>
+                </div>""")
+
+        pager = ""
+        if page < pages - 1:
+            pager = f"""
+                <nav class="pager"><ul>
+                    <li class="pager__item pager__item--next"><a href="?page={page + 1}">Next</a></li>
+                    <li class="pager__item pager__item--last"><a href="?page={pages - 1}">Last</a></li>
+                </ul></nav>"""
+
+        url = f"https://{CATALOG_HOST}{CATALOG_PATH}"
+        if page:
+            url += f"?page={page}"
+        html = f"""<html><body><div class="view-content">{"".join(rows)}</div>
+            {pager}</body></html>"""
+        archive.save(url, html)
+
+    for index in range(businesses):
+        site = f"https://www.business-{index}.es"
+        email = f"info@business-{index}.es"
+        phone = f"+34 9{randomizer.randrange(10 ** 7, 10 ** 8)}"
+        filler = "<p>Lorem ipsum dolor sit amet.</p>" * 20
+
+        # Half of the sites show the contact info only in the contact page
+        if index % 2:
+            home = f"""<a href="/blog">Blog</a><a href="/contacto">Contacto</a>{filler}"""
+            archive.save(f"{site}/contacto", f"""<html><body>{filler}
+                <a href="mailto:{email}">{email}</a> Tel: {phone}</body></html>""")
+        else:
+            home = f"""{filler}<footer><a href="mailto:{email}">{email}</a>
+                <a href="tel:{phone}">{phone}</a></footer>"""
+        archive.save(f"{site}/", f"<html><body>{home}</body></html>")
+
+    archive.close()
+
+
+def start_server(archive_path: str, latency: float) -> ReplayServer:
+    """ Serve the synthetic catalog in a free local port
+
+    Args:
+        archive_path (str): path of the archive
+        latency (float): seconds to wait before each response
+
+    Returns:
+        ReplayServer: running server
+    """
+
+    server = ReplayServer(PageArchive(archive_path), root_host=CATALOG_HOST,
+                          port=0, latency=latency)
+    server.start()
+    return server
+
+
+def get_listing_urls(businesses: int, per_page: int) -> list:
+    """ Return the urls of all listing pages (as http urls, served by the proxy)
+
+    Args:
+        businesses (int): number of businesses
+        per_page (int): businesses by listing page
+
+    Returns:
+        list: urls of the pages
+    """
+
+    pages = max(1, -(-businesses // per_page))
+    return [
+        f"http://{CATALOG_HOST}{CATALOG_PATH}" + (f"?page={page}" if page else "")
+        for page in range(pages)
+    ]
+
+
+def run_listing(settings: dict, server: ReplayServer) -> dict:
+    """ Download and parse all listing pages with the http client """
+
+    fetcher = HttpFetcher(proxy_url=server.get_url(""))
+    times, businesses = [], 0
+    for url in get_listing_urls(settings["businesses"], settings["per_page"]):
+        start_time = time.perf_counter()
+        rows = parse_listing(fetcher.get_html(url), url)
+        page_time = time.perf_counter() - start_time
+        businesses += len(rows)
+        times += [page_time / len(rows)] * len(rows) if rows else []
+
+    return {"businesses": businesses, "times": times}
+
+
+def run_contacts(settings: dict, server: ReplayServer) -> dict:
+    """ Get contact info of all business sites, at the same time,
+        searching in subpages
+    """
+
+    fetcher = HttpFetcher(pool_size=2, proxy_url=server.get_url(""))
+
+    def get_page(url: str) -> tuple:
+        html = fetcher.get_html(url)
+        if not html:
+            return [], [], [], "error"
+        emails, phones = extract_contacts(html)
+        return emails, phones, parse_anchors(html), "ok"
+
+    crawler = SubpageCrawler(get_page)
+    times = []
+
+    def get_contact_info(url: str) -> tuple:
+        start_time = time.perf_counter()
+        emails, phones, _ = crawler.crawl(url)
+        times.append(time.perf_counter() - start_time)
+        return emails, phones
+
+    links = [
+        f"http://www.business-{index}.es/"
+        for index in range(settings["businesses"])
+    ]
+    resolver = ContactResolver(get_contact_info, max_concurrency=settings["concurrency"])
+    contacts = resolver.resolve(links)
+    resolver.close()
+
+    found = sum(1 for emails, phones in contacts.values() if emails and phones)
+    return {"businesses": len(contacts), "times": times, "contacts_found": found}
+
+
+def get_rows(businesses: int) -> list:
+    """ Return synthetic rows of businesses
+
+    Args:
+        businesses (int): number of rows
+
+    Returns:
+        list: rows with the columns of the output file
+    """
+
+    return [
+        [f"Business {index}", f"https://www.business-{index}.es/", "Madrid",
+         "Web", "62", f"info@business-{index}.es", "+34910000000"]
+        for index in range(businesses)
+    ]
+
+
+def run_spreadsheet(settings: dict, folder: str) -> dict:
+    """ Save each page of rows in the excel file (OUTPUT=xlsx) """
+
+    sheets = SpreadsheetManager(os.path.join(folder, "data.xlsx"))
+    sheets.create_set_sheet("Businesses")
+    sheets.write_data([HEADER])
+    current_row = 2
+
+    rows, per_page, times = get_rows(settings["businesses"]), settings["per_page"], []
+    for start in range(0, len(rows), per_page):
+        page_rows = rows[start:start + per_page]
+        start_time = time.perf_counter()
+        sheets.write_data(page_rows, current_row)
+        sheets.save()
+        current_row += len(page_rows)
+        times += [(time.perf_counter() - start_time) / len(page_rows)] * len(page_rows)
+
+    return {"businesses": len(rows), "times": times}
+
+
+def run_stream(settings: dict, folder: str) -> dict:
+    """ Append each page of rows to the csv stream and export the excel
+        file once at the end (OUTPUT=stream)
+    """
+
+    stream = StreamWriter(os.path.join(folder, "data.csv"))
+    stream.write_rows([HEADER])
+
+    rows, per_page, times = get_rows(settings["businesses"]), settings["per_page"], []
+    for start in range(0, len(rows), per_page):
+        page_rows = rows[start:start + per_page]
+        start_time = time.perf_counter()
+        stream.write_rows(page_rows)
+        times += [(time.perf_counter() - start_time) / len(page_rows)] * len(page_rows)
+    stream.flush()
+
+    start_time = time.perf_counter()
+    sheets = SpreadsheetManager(os.path.join(folder, "data.xlsx"))
+    sheets.create_set_sheet("Businesses")
+    sheets.append_rows(stream.iter_rows())
+    sheets.save()
+    export_time = time.perf_counter() - start_time
+
+    return {"businesses": len(rows), "times": times, "export_seconds": export_time}
+
+
+def run_autorun(settings: dict, server: ReplayServer, folder: str) -> dict:
+    """ Run the full scraper with the browser, without filters """
+
+    os.environ.update({
+        "HOME_URL": f"http://{CATALOG_HOST}{CATALOG_PATH}",
+        "PROXY_SERVER": server.server.server_address[0],
+        "PROXY_PORT": str(server.server.server_address[1]),
+        "HEADLESS": "True",
+        "USE_FILTERS": "False",
+        "USE_CACHE": "False",
+        "OUTPUT": "stream",
+        "FETCH_ENGINE": settings["engine"],
+        "MAX_CONCURRENCY": str(settings["concurrency"]),
+        "EXPLORE_SUBPAGES": "True",
+        "DATA_FOLDER": folder,
+
+        # No rate limits, to measure the scraper and not the limits
+        "CATALOG_RATE": "1000",
+        "CATALOG_MAX_RATE": "1000",
+        "SITES_RATE": "1000",
+        "SITES_MAX_RATE": "1000",
+        "MAX_PER_HOST": str(settings["concurrency"]),
+    })
+
+    # Imported after the settings, read when the module loads
+    scraper_module = importlib.import_module("scraper")
+    scraper = scraper_module.Scraper()
+
+    # Count the commands sent to the browser
+    commands = {"count": 0}
+    execute = scraper.driver.execute
+
+    def count_execute(*args, **kwargs):
+        commands["count"] += 1
+        return execute(*args, **kwargs)
+    scraper.driver.execute = count_execute
+
+    # Time of each business, from the time of each page
+    times = []
+    extract_business_page = scraper.__extract_business_page__
+
+    def timed_extract_business_page(*args, **kwargs):
+        start_time = time.perf_counter()
+        page_data = extract_business_page(*args, **kwargs)
+        if page_data:
+            page_time = time.perf_counter() - start_time
+            times.extend([page_time / len(page_data)] * len(page_data))
+        return page_data
+    scraper.__extract_business_page__ = timed_extract_business_page
+
+    try:
+        scraper.autorun()
+    finally:
+        scraper.end_browser()
+
+    return {
+        "businesses": len(times),
+        "times": times,
+        "webdriver_commands": commands["count"],
+        "webdriver_commands_per_business":
+            commands["count"] / len(times) if times else None,
+    }
+
+
+def run_stage(stage: str, settings: dict) -> dict:
+    """ Run a stage and measure it (called in a new process)
+
+    Args:
+        stage (str): name of the stage
+        settings (dict): benchmark settings
+
+    Returns:
+        dict: stage results
+    """
+
+    server = start_server(settings["archive_path"], settings["latency"])
+    folder = tempfile.mkdtemp(prefix=f"benchmark_{stage}_")
+    stages = {
+        "listing": partial(run_listing, settings, server),
+        "contacts": partial(run_contacts, settings, server),
+        "spreadsheet": partial(run_spreadsheet, settings, folder),
+        "stream": partial(run_stream, settings, folder),
+        "autorun": partial(run_autorun, settings, server, folder),
+    }
+
+    start_time = time.perf_counter()
+    try:
+        result = stages[stage]()
+    except Exception as error:
+        return {"stage": stage, "error": f"{type(error).__name__}: {error}"}
+    finally:
+        server.close()
+    seconds = time.perf_counter() - start_time
+
+    times = result.pop("times")
+    businesses = result["businesses"]
+    return {
+        "stage": stage,
+        "seconds": seconds,
+        "businesses_per_minute": businesses / seconds * 60 if seconds else None,
+        "p50_seconds_per_business": get_percentile(times, 50),
+        "p95_seconds_per_business": get_percentile(times, 95),
+        "peak_rss_bytes": get_peak_rss(),
+        **result,
+    }
+
+
+def print_summary(results: list):
+    """ Show a table with the results of each stage
+
+    Args:
+        results (list): results of each stage
+    """
+
+    print(f"\n{'stage':<12} {'businesses/min':>15} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'cmds/bus':>9} {'peak MB':>9}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['stage']:<12} error: {result['error']}")
+            continue
+
+        def show(value, scale=1.0, digits=1):
+            return "-" if value is None else f"{value * scale:.{digits}f}"
+
+        print(
+            f"{result['stage']:<12} "
+            f"{show(result['businesses_per_minute']):>15} "
+            f"{show(result['p50_seconds_per_business'], 1000, 2):>9} "
+            f"{show(result['p95_seconds_per_business'], 1000, 2):>9} "
+            f"{show(result.get('webdriver_commands_per_business')):>9} "
+            f"{show(result['peak_rss_bytes'], 1 / 1024 ** 2):>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper throughput benchmarks")
+    parser.add_argument("--businesses", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="seconds of each response of the local server")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--engine", default="http", choices=["http", "selenium"],
+                        help="engine of the business pages in the autorun stage")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--output", default="",
+                        help="json file of the results (default: benchmarks/results)")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    folder = tempfile.mkdtemp(prefix="benchmark_catalog_")
+    settings = {
+        "businesses": args.businesses,
+        "per_page": args.per_page,
+        "latency": args.latency,
+        "concurrency": args.concurrency,
+        "engine": args.engine,
+        "archive_path": os.path.join(folder, "catalog.jsonl.gz"),
+    }
+    print(f"Building catalog with {args.businesses} businesses...")
+    build_catalog(settings["archive_path"], args.businesses, args.per_page)
+
+    # Each stage in a new process, to measure its memory alone
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for stage in stages:
+        print(f"Running stage {stage}...")
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_stage, (stage, settings)))
+
+    print_summary(results)
+
+    output = args.output
+    if not output:
+        results_folder = os.path.join(current_folder, "results")
+        os.makedirs(results_folder, exist_ok=True)
+        output = os.path.join(results_folder, time.strftime("%Y%m%d-%H%M%S.json"))
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {key: value for key, value in settings.items()
+                         if key != "archive_path"},
+            "results": results,
+        }, file, indent=4)
+    print(f"\nResults saved in {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import threading
+import psutil
+from libs.metrics import METRICS
+
+
+class BrowserRestartRequired(Exception):
+    """ The browser must be restarted before continue the current task
+    """
+
+
+class BrowserSupervisor ():
+    """ Watch the health of a browser: restart it after some navigations,
+        when it uses too much memory, or when its session is dead or hung
+    """
+
+    def __init__(self, browser, max_navigations: int = 500, max_rss_mb: float = 2048,
+                 check_time_out: float = 10):
+        """ Save settings
+
+        Args:
+            browser (WebScraping): browser to watch
+            max_navigations (int, optional): Pages loaded before restart the
+                browser (0 for no limit). Defaults to 500.
+            max_rss_mb (float, optional): Max memory of chrome and its driver
+                before restart the browser (0 for no limit). Defaults to 2048.
+            check_time_out (float, optional): Max seconds to answer a command,
+                before consider the session hung. Defaults to 10.
+        """
+
+        self.browser = browser
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.check_time_out = check_time_out
+        self.restarts = 0
+
+    def get_rss_mb(self) -> float:
+        """ Return the memory used by the driver and all chrome processes
+
+        Returns:
+            float: resident memory in MB, or 0 if the processes are not found
+        """
+
+        try:
+            driver_process = psutil.Process(self.browser.driver.service.process.pid)
+            processes = [driver_process] + driver_process.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return 0.0
+
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / 1024 ** 2
+
+    def is_responsive(self) -> bool:
+        """ Check if the browser session answers a simple command in time
+
+        Returns:
+            bool: False if the session is dead or hung
+        """
+
+        answer = {}
+
+        def ping():
+            try:
+                answer["value"] = self.browser.driver.execute_script("return 1;")
+            except Exception:
+                pass
+
+        # Run in a thread, a hung renderer can block the command
+        thread = threading.Thread(target=ping, daemon=True)
+        thread.start()
+        thread.join(self.check_time_out)
+        return answer.get("value") == 1
+
+    def check(self, health: bool = False) -> str:
+        """ Return why the browser must be restarted
+
+        Args:
+            health (bool, optional): also check if the session answers.
+                Defaults to False.
+
+        Returns:
+            str: "navigations", "memory" or "hung", or empty string if the
+                browser is healthy
+        """
+
+        navigations = self.browser.__navigations__
+        if self.max_navigations and navigations >= self.max_navigations:
+            return "navigations"
+
+        if self.max_rss_mb and self.get_rss_mb() > self.max_rss_mb:
+            return "memory"
+
+        if health and not self.is_responsive():
+            return "hung"
+
+        return ""
+
+    def restart(self, reason: str):
+        """ Close the browser (killing its processes if it doesn't answer)
+            and open a new one
+
+        Args:
+            reason (str): why the browser is restarted
+        """
+
+        print(f"\tRestarting browser ({reason})...")
+        self.restarts += 1
+        METRICS.inc("scraper_browser_restarts_total", labels={"reason": reason})
+
+        # Kill chrome processes of a hung session, quit can block
+        if reason == "hung" or not self.is_responsive():
+            try:
+                driver_process = psutil.Process(self.browser.driver.service.process.pid)
+                for process in driver_process.children(recursive=True):
+                    process.kill()
+            except (AttributeError, psutil.Error):
+                pass
+
+        # Without loading the last page (it can be the one that hung the
+        # browser), the task opens its pages again
+        self.browser.__reload_browser__(load_page=False)
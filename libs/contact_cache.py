@@ -0,0 +1,135 @@
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """ Return a canonical version of an url, to use as cache key:
+        lowercase scheme and host, without "www.", fragment and last slash
+
+    Args:
+        url (str): url to normalize
+
+    Returns:
+        str: normalized url
+    """
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    if scheme == "https":
+        scheme = "http"
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+class ContactCache ():
+    """ Save contact info of each url in a local sqlite database
+    """
+
+    def __init__(self, db_path: str, ttl_hours: float = 720, error_ttl_hours: float = 6,
+                 max_entries: int = 100000):
+        """ Open (or create) the database
+
+        Args:
+            db_path (str): path of the sqlite file
+            ttl_hours (float, optional): hours to keep each url. Defaults to 720.
+            error_ttl_hours (float, optional): hours to keep urls that failed to
+                load. Defaults to 6.
+            max_entries (int, optional): max urls saved, the oldest are
+                deleted first. Defaults to 100000.
+        """
+
+        self.ttl = ttl_hours * 3600
+        self.error_ttl = error_ttl_hours * 3600
+        self.max_entries = max_entries
+        self.writes = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                url TEXT PRIMARY KEY,
+                emails TEXT NOT NULL,
+                phones TEXT NOT NULL,
+                status TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS contacts_fetched_at ON contacts (fetched_at)"
+        )
+        self.connection.commit()
+
+    def get(self, url: str) -> tuple:
+        """ Return the contact info saved of an url, if it is not expired
+
+        Args:
+            url (str): url of the page
+
+        Returns:
+            tuple: emails and phones, or None if the url is not in cache
+        """
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT emails, phones, status, fetched_at FROM contacts WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        ttl = self.error_ttl if row[2] == "error" else self.ttl
+        if time.time() - row[3] > ttl:
+            return None
+
+        return json.loads(row[0]), json.loads(row[1])
+
+    def set(self, url: str, emails: list, phones: list, status: str = "ok"):
+        """ Save the contact info of an url, and delete the oldest urls
+            when the cache is full (checked each 100 writes)
+
+        Args:
+            url (str): url of the page
+            emails (list): emails found
+            phones (list): phones found
+            status (str, optional): result of the page load: "ok" or "error".
+                Defaults to "ok".
+        """
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO contacts VALUES (?, ?, ?, ?, ?)",
+                (normalize_url(url), json.dumps(emails), json.dumps(phones),
+                 status, time.time())
+            )
+            self.writes += 1
+
+            if self.writes % 100 != 0:
+                self.connection.commit()
+                return
+
+            # Delete expired and oldest urls
+            self.connection.execute(
+                "DELETE FROM contacts WHERE fetched_at < ?",
+                (time.time() - self.ttl,)
+            )
+            self.connection.execute("""
+                DELETE FROM contacts WHERE url IN (
+                    SELECT url FROM contacts ORDER BY fetched_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.connection.commit()
+
+    def close(self):
+        """ Close the database
+        """
+
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,102 @@
+import re
+import html
+from itertools import chain
+
+# Code blocks without contact info (json-ld data is kept)
+SKIP_BLOCKS_PATTERN = re.compile(
+    r"<script(?![^>]*ld\+json)[^>]*>.*?</script>|<style[^>]*>.*?</style>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Tags with its attributes (urls, ids and params have false phones)
+TAG_PATTERN = re.compile(r"<[^>]*>")
+
+# Links, emails (plain or obfuscated like "info [at] domain [dot] es")
+# and spanish phones (not amounts, like "700.000.000 euros"), in a single pattern
+AT = r"(?:@|\s*[\[\(\{]\s*(?:at|arroba)\s*[\]\)\}]\s*)"
+DOT = r"(?:\.|\s*[\[\(\{]\s*(?:dot|punto)\s*[\]\)\}]\s*)"
+CONTACTS_PATTERN = re.compile(
+    r"tel:(?P<tel>\+?[\d\s().-]{6,20}\d)"
+    rf"|(?P<email>[a-z0-9][a-z0-9._%+-]*{AT}[a-z0-9-]+(?:{DOT}[a-z0-9-]+)*{DOT}[a-z]{{2,}})"
+    r"|(?<![\w+.,])(?P<phone>(?:(?:\+|00)\s?34[\s.-]?)?"
+    r"(?:[689][\s.-]?\d|7[\s.-]?[1-4])(?:[\s.-]?\d){7})"
+    r"(?![.,]?\d)(?!\s*(?:€|eur|\$|%))",
+    re.IGNORECASE
+)
+AT_PATTERN = re.compile(AT, re.IGNORECASE)
+DOT_PATTERN = re.compile(DOT, re.IGNORECASE)
+
+# Files and services found as false emails (like "logo@2x.png")
+SKIP_EMAIL_ENDINGS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js",
+    "example.com", "sentry.io", "wixpress.com",
+)
+
+
+def normalize_phone(phone: str) -> str:
+    """ Return a phone without spaces and symbols, with the "+34" prefix
+        if it is a spanish phone
+
+    Args:
+        phone (str): phone as written in the page
+
+    Returns:
+        str: normalized phone, like "+34912345678"
+    """
+
+    digits = re.sub(r"\D", "", phone)
+    if phone.strip().startswith("+"):
+        digits = f"00{digits}"
+
+    if digits.startswith("0034"):
+        digits = digits[4:]
+    elif digits.startswith("34") and len(digits) == 11:
+        digits = digits[2:]
+    elif digits.startswith("00"):
+        return f"+{digits[2:]}"
+
+    if len(digits) == 9 and digits[0] in "6789":
+        return f"+34{digits}"
+    return digits
+
+
+def extract_contacts(page_html: str) -> tuple:
+    """ Find the emails and phones of a page, with a single pattern over its
+        text and its tags
+
+    Args:
+        page_html (str): html of the page
+
+    Returns:
+        tuple: emails and phones found, without duplicates
+
+        Example:
+        (
+            ["info@domain.es", ...],
+            ["+34912345678", ...]
+        )
+    """
+
+    page_html = SKIP_BLOCKS_PATTERN.sub(" ", page_html or "")
+
+    # Plain phones only in the text, and links (tel: and mailto:) in the tags
+    text = html.unescape(TAG_PATTERN.sub(" ", page_html))
+    tags = html.unescape(" ".join(TAG_PATTERN.findall(page_html)))
+    matches = chain(
+        CONTACTS_PATTERN.finditer(text),
+        filter(lambda match: not match.group("phone"), CONTACTS_PATTERN.finditer(tags)),
+    )
+
+    emails, phones = {}, {}
+    for match in matches:
+        if match.group("email"):
+            email = AT_PATTERN.sub("@", match.group("email"), count=1)
+            email = DOT_PATTERN.sub(".", email).lower()
+            if not email.endswith(SKIP_EMAIL_ENDINGS):
+                emails[email] = True
+        else:
+            phone = normalize_phone(match.group("tel") or match.group("phone"))
+            if len(phone.lstrip("+")) >= 6:
+                phones[phone] = True
+
+    return list(emails), list(phones)
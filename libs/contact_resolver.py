@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class ContactResolver ():
+    """ Get contact info from many links at the same time, with asyncio
+    """
+
+    def __init__(self, get_contact_info: callable, max_concurrency: int = 20,
+                 max_per_host: int = 2, time_out: int = 20):
+        """ Save settings and create the threads used to run the requests
+
+        Args:
+            get_contact_info (callable): function to get (emails, phones) from a link
+            max_concurrency (int, optional): Max links loading at the same time.
+                Defaults to 20.
+            max_per_host (int, optional): Max links of the same host loading at
+                the same time. Defaults to 2.
+            time_out (int, optional): Max seconds to get contact info of each link,
+                since its thread starts. Defaults to 20.
+        """
+
+        self.get_contact_info = get_contact_info
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.time_out = time_out
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def resolve(self, links: list) -> dict:
+        """ Get contact info from all links
+
+        Args:
+            links (list): links to search contact info
+
+        Returns:
+            dict: emails and phones by link
+
+            Example:
+            {
+                "link1": (["email1", ...], ["phone1", ...]),
+                ...
+            }
+        """
+
+        links = list(dict.fromkeys(links))
+        if not links:
+            return {}
+
+        return asyncio.run(self.__resolve_links__(links))
+
+    async def __resolve_links__(self, links: list) -> dict:
+        """ Run all links at the same time, respecting the concurrency limits
+
+        Args:
+            links (list): unique links to search contact info
+
+        Returns:
+            dict: emails and phones by link
+        """
+
+        global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_semaphores = {}
+        for link in links:
+            host = urlparse(link).netloc.lower()
+            if host not in host_semaphores:
+                host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+
+        tasks = []
+        for link in links:
+            host_semaphore = host_semaphores[urlparse(link).netloc.lower()]
+            tasks.append(self.__resolve_link__(link, global_semaphore, host_semaphore))
+
+        results = await asyncio.gather(*tasks)
+        return dict(zip(links, results))
+
+    async def __resolve_link__(self, link: str, global_semaphore: asyncio.Semaphore,
+                               host_semaphore: asyncio.Semaphore) -> tuple:
+        """ Get contact info from a link, without raising errors
+
+        Args:
+            link (str): link to search contact info
+            global_semaphore (asyncio.Semaphore): limit of all links
+            host_semaphore (asyncio.Semaphore): limit of the link host
+
+        Returns:
+            tuple: emails and phones found, empty lists on error or time out
+        """
+
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run_contact_info() -> tuple:
+            loop.call_soon_threadsafe(started.set)
+            return self.get_contact_info(link)
+
+        await host_semaphore.acquire()
+        await global_semaphore.acquire()
+        future = loop.run_in_executor(self.executor, run_contact_info)
+
+        # Release the limits when the thread ends, not at time out: the thread
+        # can't be stopped, and the next links would wait a free thread
+        def release(_):
+            global_semaphore.release()
+            host_semaphore.release()
+        future.add_done_callback(release)
+
+        # Count the time out since the thread starts (not while it waits a
+        # thread used by links of other calls)
+        try:
+            await started.wait()
+            return await asyncio.wait_for(asyncio.shield(future), self.time_out)
+        except Exception:
+            return [], []
+
+    def close(self):
+        """ Stop the threads used to run the requests
+        """
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
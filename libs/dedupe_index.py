@@ -0,0 +1,140 @@
+import os
+import re
+import unicodedata
+from urllib.parse import urlparse
+
+SOCIAL_HOSTS = (
+    "facebook.com", "twitter.com", "x.com", "linkedin.com", "instagram.com",
+    "youtube.com", "tiktok.com", "wa.me", "api.whatsapp.com",
+)
+
+
+def normalize_name(name: str) -> str:
+    """ Return a name without accents, case, symbols and extra spaces
+
+    Args:
+        name (str): business name
+
+    Returns:
+        str: normalized name
+    """
+
+    name = unicodedata.normalize("NFKD", str(name or ""))
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    name = re.sub(r"[^0-9a-z]+", " ", name.casefold())
+    return name.strip()
+
+
+class DedupeIndex ():
+    """ Hash set of the businesses already saved, by normalized name and domain
+    """
+
+    def __init__(self, ignore_hosts: list = []):
+        """ Create an empty index
+
+        Args:
+            ignore_hosts (list, optional): hosts not used as business domain
+                (like the catalog host). Defaults to [].
+        """
+
+        ignore_hosts = [host.lower().removeprefix("www.") for host in ignore_hosts]
+        self.ignore_hosts = tuple(ignore_hosts) + SOCIAL_HOSTS
+        self.keys = set()
+        self.__new_keys__ = []
+
+    def get_domain(self, links) -> str:
+        """ Return the domain of the business: the first one in alphabetical
+            order, so it doesn't depend on the order of the links
+
+        Args:
+            links (list | str): business links, as list or joined with ", "
+
+        Returns:
+            str: domain without "www.", or empty string if not found
+        """
+
+        if isinstance(links, str):
+            links = links.split(", ")
+
+        hosts = []
+        for link in links or []:
+            host = urlparse(str(link).strip()).netloc.lower().split(":")[0]
+            if host.startswith("www."):
+                host = host[4:]
+            if not host:
+                continue
+            if any(host == ignore or host.endswith(f".{ignore}")
+                   for ignore in self.ignore_hosts):
+                continue
+            hosts.append(host)
+
+        return min(hosts, default="")
+
+    def get_key(self, name: str, links) -> str:
+        """ Return the key of a business
+
+        Args:
+            name (str): business name
+            links (list | str): business links
+
+        Returns:
+            str: normalized name and domain
+        """
+
+        return f"{normalize_name(name)}|{self.get_domain(links)}"
+
+    def contains(self, name: str, links) -> bool:
+        """ Check if a business is in the index
+
+        Args:
+            name (str): business name
+            links (list | str): business links
+
+        Returns:
+            bool: True if the business is in the index
+        """
+
+        return self.get_key(name, links) in self.keys
+
+    def add(self, name: str, links) -> bool:
+        """ Add a business to the index
+
+        Args:
+            name (str): business name
+            links (list | str): business links
+
+        Returns:
+            bool: True if the business is new, False if it was already in index
+        """
+
+        key = self.get_key(name, links)
+        if key in self.keys:
+            return False
+
+        self.keys.add(key)
+        self.__new_keys__.append(key)
+        return True
+
+    def load(self, file_path: str):
+        """ Load keys saved in a file
+
+        Args:
+            file_path (str): path of the index file
+        """
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            self.keys.update(line.rstrip("\n") for line in file if line.strip())
+        self.__new_keys__ = []
+
+    def save(self, file_path: str):
+        """ Append the keys added since the last save to a file
+
+        Args:
+            file_path (str): path of the index file
+        """
+
+        mode = "a" if os.path.exists(file_path) else "w"
+        with open(file_path, mode, encoding="utf-8") as file:
+            for key in self.__new_keys__:
+                file.write(f"{key}\n")
+        self.__new_keys__ = []
@@ -0,0 +1,276 @@
+import time
+import urllib3
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+from libs.rate_limiter import RateLimiter
+from libs.page_archive import PageArchive
+from libs.profiler import timed
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " \
+                     "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+
+class AnchorsParser(HTMLParser):
+    """ Collect the href and text of each anchor in a html document
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.anchors = []
+        self.__current_anchor__ = None
+
+    def handle_starttag(self, tag: str, attrs: list):
+        if tag != "a":
+            return
+
+        href = dict(attrs).get("href") or ""
+        self.__current_anchor__ = {"href": href.strip(), "text": ""}
+        self.anchors.append(self.__current_anchor__)
+
+    def handle_endtag(self, tag: str):
+        if tag == "a":
+            self.__current_anchor__ = None
+
+    def handle_data(self, data: str):
+        if self.__current_anchor__ is not None:
+            self.__current_anchor__["text"] += data
+
+
+class ListingParser(HTMLParser):
+    """ Collect the name and links of each row of a listing page
+    """
+
+    def __init__(self, base_url: str, row_class: str, name_tag: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.row_class = row_class
+        self.name_tag = name_tag
+        self.rows = []
+        self.__row_tag__ = ""
+        self.__row_depth__ = 0
+        self.__in_name__ = False
+
+    def handle_starttag(self, tag: str, attrs: list):
+        attrs = dict(attrs)
+
+        # Start a new row
+        if not self.__row_depth__:
+            classes = (attrs.get("class") or "").split()
+            if self.row_class in classes:
+                self.__row_tag__ = tag
+                self.__row_depth__ = 1
+                self.rows.append({"name": "", "links": []})
+            return
+
+        if tag == self.__row_tag__:
+            self.__row_depth__ += 1
+        elif tag == self.name_tag:
+            self.__in_name__ = True
+        elif tag == "a" and attrs.get("href"):
+            self.rows[-1]["links"].append(urljoin(self.base_url, attrs["href"].strip()))
+
+    def handle_endtag(self, tag: str):
+        if not self.__row_depth__:
+            return
+
+        if tag == self.__row_tag__:
+            self.__row_depth__ -= 1
+        elif tag == self.name_tag:
+            self.__in_name__ = False
+            self.rows[-1]["name"] = " ".join(self.rows[-1]["name"].split())
+
+    def handle_data(self, data: str):
+        if self.__row_depth__ and self.__in_name__:
+            self.rows[-1]["name"] += data
+
+
+def parse_listing(html: str, base_url: str, row_class: str = "views-row",
+                  name_tag: str = "h2") -> list:
+    """ Return the name and links of each row of a listing page
+
+    Args:
+        html (str): html of the page
+        base_url (str): url of the page, to make the links absolute
+        row_class (str, optional): css class of each row. Defaults to "views-row".
+        name_tag (str, optional): tag with the name of each row. Defaults to "h2".
+
+    Returns:
+        list: rows data
+
+        Example:
+        [
+            {"name": "name", "links": ["link1", "link2", ...]},
+            ...
+        ]
+    """
+
+    parser = ListingParser(base_url, row_class, name_tag)
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def parse_anchors(html: str) -> list:
+    """ Return the anchors of a html document
+
+    Args:
+        html (str): html of the page
+
+    Returns:
+        list: anchors found in the page
+
+        Example:
+        [
+            {"href": "mailto:info@sample.com", "text": "info@sample.com"},
+            ...
+        ]
+    """
+
+    parser = AnchorsParser()
+    parser.feed(html)
+    parser.close()
+    return parser.anchors
+
+
+class HttpFetcher ():
+    """ Download pages with plain http requests, reusing keep-alive connections
+    """
+
+    def __init__(self, time_out: int = 10, user_agent: str = "",
+                 pool_size: int = 10, retries: int = 2,
+                 rate_limiter: RateLimiter = None, archive: PageArchive = None,
+                 proxy_url: str = ""):
+        """ Create the connections pool
+
+        Args:
+            time_out (int, optional): Max seconds to read each page. Defaults to 10.
+            user_agent (str, optional): user agent value to use. Defaults to "".
+            pool_size (int, optional): Connections kept alive by host. Defaults to 10.
+            retries (int, optional): Retries on connection errors. Defaults to 2.
+            rate_limiter (RateLimiter, optional): Control the speed of the
+                requests by host. Defaults to None.
+            archive (PageArchive, optional): Save the html pages loaded, to replay
+                them later. Defaults to None.
+            proxy_url (str, optional): http proxy to use, like
+                "http://127.0.0.1:8765". Defaults to "".
+        """
+
+        self.rate_limiter = rate_limiter
+        self.archive = archive
+
+        headers = {
+            "User-Agent": user_agent or DEFAULT_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+        }
+
+        pool_class = urllib3.PoolManager
+        pool_args = {}
+        if proxy_url:
+            pool_class = urllib3.ProxyManager
+            pool_args["proxy_url"] = proxy_url
+
+        self.pool = pool_class(
+            **pool_args,
+            num_pools=50,
+            maxsize=pool_size,
+            block=False,
+            headers=headers,
+            timeout=urllib3.Timeout(connect=time_out, read=time_out),
+            # Retries by error type: a total limit would also count the redirects
+            retries=urllib3.Retry(
+                total=None,
+                connect=retries,
+                read=retries,
+                other=retries,
+                redirect=5,
+                raise_on_status=False,
+            ),
+        )
+
+    @timed("http.get_html")
+    def get_html(self, url: str) -> str:
+        """ Return the html of a page, or empty string if it can't be loaded
+
+        Args:
+            url (str): url of the page
+
+        Returns:
+            str: html of the page
+        """
+
+        # Emails and phones links, without host (and without rate)
+        if urlsplit(url).scheme not in ("http", "https"):
+            return ""
+
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+        start_time = time.monotonic()
+
+        # Body read only for html pages (not files like pdfs)
+        try:
+            response = self.pool.request("GET", url, preload_content=False)
+        except Exception:
+            response = None
+
+        # Save request speed and status, to adapt the host rate
+        if self.rate_limiter:
+            latency = time.monotonic() - start_time
+            error = response is None or response.status >= 400
+            self.rate_limiter.record(url, latency, error=error)
+
+        if response is None:
+            return ""
+
+        content_type = response.headers.get("Content-Type", "")
+        if response.status >= 400 or (content_type and "html" not in content_type):
+
+            # Close the connection, without downloading the body
+            response.close()
+            response.release_conn()
+            return ""
+
+        try:
+            data = response.data
+        except Exception:
+            return ""
+        finally:
+            response.release_conn()
+
+        # Decode with the charset sent by the server
+        charset = "utf-8"
+        if "charset=" in content_type:
+            charset = content_type.split("charset=")[-1].split(";")[0].strip()
+        try:
+            html = data.decode(charset, errors="replace")
+        except LookupError:
+            html = data.decode("utf-8", errors="replace")
+
+        if self.archive:
+            self.archive.save(url, html, response.status)
+
+        return html
+
+    def get_anchors(self, url: str) -> list:
+        """ Return the anchors of a page
+
+        Args:
+            url (str): url of the page
+
+        Returns:
+            list: anchors found in the page
+
+            Example:
+            [
+                {"href": "mailto:info@sample.com", "text": "info@sample.com"},
+                ...
+            ]
+        """
+
+        return parse_anchors(self.get_html(url))
+
+    def close(self):
+        """ Close all open connections
+        """
+
+        self.pool.clear()
@@ -0,0 +1,216 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Help text and type of each metric
+METRICS_INFO = {
+    "scraper_pages_total": ("Listing pages saved", "counter"),
+    "scraper_businesses_total": ("Businesses saved", "counter"),
+    "scraper_businesses_skipped_total": ("Businesses skipped, already scraped", "counter"),
+    "scraper_contact_fetches_total": ("Business pages loaded, by status", "counter"),
+    "scraper_contact_cache_hits_total": ("Contact info read from cache", "counter"),
+    "scraper_contact_cache_misses_total": ("Contact info not found in cache", "counter"),
+    "scraper_errors_total": ("Failures, by stage", "counter"),
+    "scraper_browser_restarts_total": ("Browser restarts, by reason", "counter"),
+    "scraper_filters_done_total": ("Filters combinations finished", "counter"),
+    "scraper_filters_pending": ("Filters combinations waiting", "gauge"),
+    "scraper_current_filter": ("Filters combination in progress", "gauge"),
+    "scraper_rows_written": ("Rows saved in disk in this run", "gauge"),
+    "scraper_last_page_timestamp_seconds": ("Time of the last page saved", "gauge"),
+    "scraper_start_timestamp_seconds": ("Time of the start of the run", "gauge"),
+}
+
+
+def escape_label(value) -> str:
+    """ Return a label value escaped for the prometheus text format
+
+    Args:
+        value: label value
+
+    Returns:
+        str: escaped value
+    """
+
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """ Serve the metrics in "/metrics"
+    """
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+class Metrics ():
+    """ Counters and gauges of the run, exported in prometheus text format
+        with a local http endpoint or a textfile rewritten periodically
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.lock = threading.Lock()
+        self.server = None
+        self.__stop_event__ = threading.Event()
+
+    def inc(self, name: str, value: float = 1, labels: dict = {}):
+        """ Increase a counter
+
+        Args:
+            name (str): metric name
+            value (float, optional): value to add. Defaults to 1.
+            labels (dict, optional): labels of the series. Defaults to {}.
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: dict = {}):
+        """ Set the value of a gauge
+
+        Args:
+            name (str): metric name
+            value (float): new value
+            labels (dict, optional): labels of the series. Defaults to {}.
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = value
+
+    def set_info(self, name: str, labels: dict, group: dict = {}):
+        """ Replace all series of a gauge with a single one (with value 1),
+            used to show the current state as labels
+
+        Args:
+            name (str): metric name
+            labels (dict): labels of the series
+            group (dict, optional): replace only the series with these labels
+                (like the state of each worker). Defaults to {}.
+        """
+
+        with self.lock:
+            for key in [key for key in self.gauges if key[0] == name]:
+                if group.items() <= dict(key[1]).items():
+                    del self.gauges[key]
+            self.gauges[(name, tuple(sorted(labels.items())))] = 1
+
+    def drain_counters(self) -> list:
+        """ Return the counters and reset them, to send them to other process
+
+        Returns:
+            list: name, labels and value of each counter
+        """
+
+        with self.lock:
+            counters = [(name, dict(labels), value)
+                        for (name, labels), value in self.counters.items()]
+            self.counters = {}
+        return counters
+
+    def merge_counters(self, counters: list):
+        """ Add the counters of other process
+
+        Args:
+            counters (list): name, labels and value of each counter
+        """
+
+        for name, labels, value in counters:
+            self.inc(name, value, labels)
+
+    def render(self) -> str:
+        """ Return all metrics in prometheus text format
+
+        Returns:
+            str: metrics text
+        """
+
+        with self.lock:
+            series = list(self.counters.items()) + list(self.gauges.items())
+
+        lines = []
+        described = set()
+        for (name, labels), value in sorted(series):
+            if name not in described:
+                described.add(name)
+                help_text, metric_type = METRICS_INFO.get(name, (name, "untyped"))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+            labels_text = ",".join(f'{key}="{escape_label(label)}"' for key, label in labels)
+            if labels_text:
+                labels_text = f"{{{labels_text}}}"
+            lines.append(f"{name}{labels_text} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, file_path: str):
+        """ Save the metrics in a file, replacing it in a single step
+            (so the readers never see a partial file)
+
+        Args:
+            file_path (str): path of the .prom file
+        """
+
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temp_path, file_path)
+
+    def start_server(self, port: int, host: str = "127.0.0.1"):
+        """ Serve the metrics in a background thread
+
+        Args:
+            port (int): port to listen
+            host (str, optional): address to listen. Defaults to "127.0.0.1".
+        """
+
+        self.server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def start_textfile(self, file_path: str, interval: float = 15):
+        """ Rewrite the metrics file each some seconds, in a background thread
+
+        Args:
+            file_path (str): path of the .prom file
+            interval (float, optional): seconds between writes. Defaults to 15.
+        """
+
+        def write_loop():
+            while not self.__stop_event__.wait(interval):
+                self.write_textfile(file_path)
+
+        threading.Thread(target=write_loop, daemon=True).start()
+
+    def stop(self):
+        """ Stop the http server and the textfile writes
+        """
+
+        self.__stop_event__.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Metrics shared by the libs and the scraper
+METRICS = Metrics()
+METRICS.set("scraper_start_timestamp_seconds", time.time())
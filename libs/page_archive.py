@@ -0,0 +1,115 @@
+import os
+import gzip
+import json
+import time
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from libs.contact_cache import normalize_url
+
+
+def get_archive_key(url: str) -> str:
+    """ Return the key of an url in the archive: normalized url with
+        its query params sorted
+
+    Args:
+        url (str): url of the page
+
+    Returns:
+        str: archive key
+    """
+
+    parts = urlsplit(normalize_url(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+class PageArchive ():
+    """ Compressed file with the html of the pages visited, to replay a run
+        without internet. Each page is a json line of a gzip file, the last
+        version of each url is used
+    """
+
+    def __init__(self, file_path: str, load: bool = True):
+        """ Load the pages saved in the file (if exists)
+
+        Args:
+            file_path (str): path of the .jsonl.gz file
+            load (bool, optional): keep the pages in memory, to read them.
+                False to only append pages (to record a run, without
+                growing the memory). Defaults to True.
+        """
+
+        self.file_path = file_path
+        self.load = load
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.file = None
+
+        if self.load and os.path.exists(self.file_path):
+            self.__load__()
+
+    def __load__(self):
+        """ Read all pages of the file, skipping the ones cut by a crash
+        """
+
+        with gzip.open(self.file_path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    try:
+                        page = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.pages[get_archive_key(page["url"])] = page
+            except (EOFError, OSError):
+                pass
+
+    def save(self, url: str, html: str, status: int = 200):
+        """ Add (or replace) a page in the archive
+
+        Args:
+            url (str): url of the page
+            html (str): html of the page
+            status (int, optional): http status code. Defaults to 200.
+        """
+
+        page = {"url": url, "status": status, "html": html, "saved_at": time.time()}
+
+        # Each write is a complete gzip member in a single unbuffered append,
+        # so the file is valid after a crash, and it can be shared by processes
+        with self.lock:
+            if self.load:
+                self.pages[get_archive_key(url)] = page
+            if not self.file:
+                self.file = open(self.file_path, "ab", buffering=0)
+            line = json.dumps(page, ensure_ascii=False) + "\n"
+            self.file.write(gzip.compress(line.encode("utf-8")))
+
+    def get(self, url: str) -> dict:
+        """ Return a page saved
+
+        Args:
+            url (str): url of the page
+
+        Returns:
+            dict: url, status and html of the page, or None if it is not saved
+        """
+
+        return self.pages.get(get_archive_key(url))
+
+    def get_hosts(self) -> set:
+        """ Return the hosts of all pages saved
+
+        Returns:
+            set: hosts, without "www."
+        """
+
+        return {urlsplit(key).netloc for key in self.pages}
+
+    def close(self):
+        """ Close the archive file
+        """
+
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+
+# Upper limits (seconds) of the histogram buckets of each span
+BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, float("inf"),
+)
+
+
+class SpanStats ():
+    """ Count, total time and histogram of the durations of a span
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, duration: float):
+        """ Add a duration
+
+        Args:
+            duration (float): seconds of the span
+        """
+
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+
+    def get_percentile(self, percent: float) -> float:
+        """ Return an estimated percentile of the durations, interpolated
+            inside its histogram bucket
+
+        Args:
+            percent (float): percentile, from 0 to 100
+
+        Returns:
+            float: seconds, or 0 if there are no durations
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = min(BUCKETS[index], self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (max(upper, lower) - lower) * fraction
+            cumulative += bucket_count
+
+        return self.max
+
+
+class Profiler ():
+    """ Measure the time of the hot paths with spans (context manager or
+        decorator), keeping a histogram by span and a trace of the calls.
+        Spans cost a single flag check when the profiler is disabled
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 200000):
+        """ Create an empty profiler
+
+        Args:
+            enabled (bool, optional): measure the spans. Defaults to False.
+            max_events (int, optional): max calls kept for the trace file.
+                Defaults to 200000.
+        """
+
+        self.enabled = enabled
+        self.max_events = max_events
+        self.stats = {}
+        self.events = []
+        self.lock = threading.Lock()
+        self.__local__ = threading.local()
+
+    def record(self, name: str, start: float, duration: float, parent: str = ""):
+        """ Save the duration of a span
+
+        Args:
+            name (str): span name
+            start (float): epoch time of the start
+            duration (float): seconds of the span
+            parent (str, optional): name of the span that contains it. Defaults to "".
+        """
+
+        with self.lock:
+            stats = self.stats.get(name)
+            if not stats:
+                stats = self.stats[name] = SpanStats()
+            stats.add(duration)
+
+            if len(self.events) < self.max_events:
+                self.events.append({
+                    "name": name,
+                    "start": round(start, 6),
+                    "duration": round(duration, 6),
+                    "parent": parent,
+                    "process": os.getpid(),
+                    "thread": threading.current_thread().name,
+                })
+
+    @contextmanager
+    def span(self, name: str):
+        """ Measure the time of a block of code
+
+        Args:
+            name (str): span name
+
+        Example:
+            with profiler.span("scraper.save_page"):
+                ...
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        stack = getattr(self.__local__, "stack", None)
+        if stack is None:
+            stack = self.__local__.stack = []
+        parent = stack[-1] if stack else ""
+        stack.append(name)
+
+        start = time.time()
+        start_counter = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.record(name, start, time.perf_counter() - start_counter, parent)
+
+    def timed(self, name: str = "") -> callable:
+        """ Decorator to measure the time of each call of a function
+
+        Args:
+            name (str, optional): span name. Defaults to "" (function name).
+
+        Returns:
+            callable: decorator
+        """
+
+        def decorator(function: callable) -> callable:
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.span(span_name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def drain_stats(self) -> dict:
+        """ Return the stats and calls measured and reset them, to send them
+            to other process
+
+        Returns:
+            dict: count, total, max and buckets of each span, and calls
+        """
+
+        with self.lock:
+            stats = [
+                (name, stats.count, stats.total, stats.max, stats.buckets)
+                for name, stats in self.stats.items()
+            ]
+            events = self.events
+            self.stats = {}
+            self.events = []
+        return {"stats": stats, "events": events}
+
+    def merge_stats(self, profile: dict):
+        """ Add the stats and calls measured in other process
+
+        Args:
+            profile (dict): stats and calls, from drain_stats
+        """
+
+        with self.lock:
+            for name, count, total, max_duration, buckets in profile["stats"]:
+                stats = self.stats.get(name)
+                if not stats:
+                    stats = self.stats[name] = SpanStats()
+                stats.count += count
+                stats.total += total
+                stats.max = max(stats.max, max_duration)
+                stats.buckets = [
+                    bucket + new_bucket
+                    for bucket, new_bucket in zip(stats.buckets, buckets)
+                ]
+
+            free_events = max(0, self.max_events - len(self.events))
+            self.events += profile["events"][:free_events]
+
+    def get_summary(self) -> str:
+        """ Return a table with the times of each span, slowest first
+
+        Returns:
+            str: summary table
+        """
+
+        lines = [
+            f"{'span':<36} {'count':>8} {'total s':>10} {'mean ms':>9} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+        ]
+        with self.lock:
+            spans = sorted(self.stats.items(), key=lambda item: -item[1].total)
+            for name, stats in spans:
+                lines.append(
+                    f"{name:<36} {stats.count:>8} {stats.total:>10.2f} "
+                    f"{stats.total / stats.count * 1000:>9.1f} "
+                    f"{stats.get_percentile(50) * 1000:>9.1f} "
+                    f"{stats.get_percentile(95) * 1000:>9.1f} "
+                    f"{stats.max * 1000:>9.1f}"
+                )
+        return "\n".join(lines)
+
+    def write_trace(self, file_path: str):
+        """ Save the calls measured in a jsonl file, one span by line
+
+        Args:
+            file_path (str): path of the trace file
+        """
+
+        with self.lock:
+            events = self.events
+            self.events = []
+
+        with open(file_path, "w", encoding="utf-8") as file:
+            for event in events:
+                file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+# Profiler shared by the libs and the scraper (enabled by the scraper settings)
+PROFILER = Profiler()
+timed = PROFILER.timed
@@ -0,0 +1,112 @@
+import os
+import json
+
+
+class ProgressJournal ():
+    """ Append only file with the pages and tasks already finished,
+        used to resume a run after a crash
+    """
+
+    def __init__(self, file_path: str):
+        """ Load the progress saved in the file (if exists)
+
+        Args:
+            file_path (str): path of the jsonl file
+        """
+
+        self.file_path = file_path
+        self.done = set()
+        self.pages = {}
+
+        if os.path.exists(self.file_path):
+            self.__load__()
+
+        self.file = open(self.file_path, "a", encoding="utf-8")
+
+        # Close the last line, if it was cut by a crash
+        if self.file.tell() > 0:
+            with open(self.file_path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    self.file.write("\n")
+
+    def __load__(self):
+        """ Read all events of the file, skipping incomplete lines
+        """
+
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+
+                if event["event"] == "done":
+                    self.done.add(event["key"])
+                elif event["event"] == "page":
+                    self.pages[event["key"]] = event["page"]
+
+    def __append__(self, event: dict):
+        """ Write an event in the file and force it to disk
+
+        Args:
+            event (dict): event data
+        """
+
+        self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def is_done(self, key: str) -> bool:
+        """ Check if a task was finished
+
+        Args:
+            key (str): task key
+
+        Returns:
+            bool: True if the task was finished
+        """
+
+        return key in self.done
+
+    def get_last_page(self, key: str) -> int:
+        """ Return the last page finished of a task
+
+        Args:
+            key (str): task key
+
+        Returns:
+            int: page number, or 0 if no pages were finished
+        """
+
+        return self.pages.get(key, 0)
+
+    def save_page(self, key: str, page: int):
+        """ Save a page as finished
+
+        Args:
+            key (str): task key
+            page (int): page number
+        """
+
+        self.pages[key] = page
+        self.__append__({"event": "page", "key": key, "page": page})
+
+    def save_done(self, key: str):
+        """ Save a task as finished
+
+        Args:
+            key (str): task key
+        """
+
+        self.done.add(key)
+        self.__append__({"event": "done", "key": key})
+
+    def clear(self):
+        """ Delete all progress, when the run ends
+        """
+
+        self.file.close()
+        self.done = set()
+        self.pages = {}
+        self.file = open(self.file_path, "w", encoding="utf-8")
@@ -0,0 +1,140 @@
+import time
+import threading
+from urllib.parse import urlparse
+
+
+class TokenBucket ():
+    """ Requests budget of a single host, with a rate that can change
+    """
+
+    def __init__(self, rate: float, max_rate: float, min_rate: float, burst: int = 1):
+        """ Save settings and start with a full bucket
+
+        Args:
+            rate (float): initial requests by second
+            max_rate (float): max requests by second
+            min_rate (float): min requests by second
+            burst (int, optional): requests allowed without waiting. Defaults to 1.
+        """
+
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.step = max(rate * 0.1, 0.05)
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """ Take a token, even if it is not available yet
+
+        Returns:
+            float: seconds to wait before use the token
+        """
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+    def adapt(self, latency: float, error: bool, target_latency: float):
+        """ Update the rate: slow down fast with errors or slow responses,
+            and speed up slowly with good responses
+
+        Args:
+            latency (float): seconds of the last request
+            error (bool): True if the last request failed
+            target_latency (float): max seconds of a good response
+        """
+
+        if error:
+            self.rate = max(self.min_rate, self.rate * 0.5)
+        elif latency > target_latency:
+            self.rate = max(self.min_rate, self.rate * 0.8)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+
+class RateLimiter ():
+    """ Control the requests speed by host, with adaptive token buckets
+    """
+
+    def __init__(self, rate: float = 2, max_rate: float = 10, min_rate: float = 0.1,
+                 target_latency: float = 3, hosts: dict = {}):
+        """ Save settings
+
+        Args:
+            rate (float, optional): initial requests by second of each host.
+                Defaults to 2.
+            max_rate (float, optional): max requests by second of each host.
+                Defaults to 10.
+            min_rate (float, optional): min requests by second of each host.
+                Defaults to 0.1.
+            target_latency (float, optional): max seconds of a good response.
+                Defaults to 3.
+            hosts (dict, optional): custom budget by host, with "rate" and
+                "max_rate" keys. Defaults to {}.
+
+            Example of hosts:
+            {
+                "www.acelerapyme.gob.es": {"rate": 1, "max_rate": 4},
+            }
+        """
+
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.target_latency = target_latency
+        self.hosts = hosts
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def __get_bucket__(self, url: str) -> TokenBucket:
+        """ Return the bucket of the url host, creating it if not exists
+
+        Args:
+            url (str): url to request
+
+        Returns:
+            TokenBucket: bucket of the host
+        """
+
+        host = urlparse(url).netloc.lower()
+        if host not in self.buckets:
+            host_settings = self.hosts.get(host, {})
+            self.buckets[host] = TokenBucket(
+                rate=host_settings.get("rate", self.rate),
+                max_rate=host_settings.get("max_rate", self.max_rate),
+                min_rate=self.min_rate,
+            )
+        return self.buckets[host]
+
+    def wait(self, url: str):
+        """ Wait until the host of the url can receive a new request
+
+        Args:
+            url (str): url to request
+        """
+
+        with self.lock:
+            wait_time = self.__get_bucket__(url).reserve()
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def record(self, url: str, latency: float, error: bool = False):
+        """ Save the result of a request, to adapt the host rate
+
+        Args:
+            url (str): requested url
+            latency (float): seconds of the request
+            error (bool, optional): True if the request failed or the server
+                returned an error status. Defaults to False.
+        """
+
+        with self.lock:
+            self.__get_bucket__(url).adapt(latency, error, self.target_latency)
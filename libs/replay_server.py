@@ -0,0 +1,208 @@
+import re
+import time
+import argparse
+import threading
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from libs.page_archive import PageArchive
+
+# Scripts are removed, so links (pager, facets) work as plain links
+SCRIPT_PATTERN = re.compile(
+    r"<script(?![^>]*ld\+json)[^>]*>.*?</script>",
+    re.IGNORECASE | re.DOTALL
+)
+URL_ATTRIB_PATTERN = re.compile(
+    r"""(\s(?:href|src|action)\s*=\s*)(["'])(.*?)\2""",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """ Serve the pages of the archive as a http proxy (each site in its own
+        host), and the catalog host also in the root path of the server
+    """
+
+    def do_GET(self):
+        replay = self.server.replay
+        host, path = replay.get_host_path(self.path, self.headers.get("Host", ""))
+
+        if replay.latency:
+            time.sleep(replay.latency)
+
+        page = replay.archive.get(f"http://{host}{path}")
+        if not page:
+            self.__send__(404, "<html><body>Page not found in archive</body></html>")
+            return
+
+        self.__send__(page["status"], replay.rewrite_html(page["html"]))
+
+    def __send__(self, status: int, html: str):
+        """ Send a html response
+
+        Args:
+            status (int): http status code
+            html (str): html of the page
+        """
+
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+class ReplayHTTPServer(ThreadingHTTPServer):
+    """ Threaded server with a long queue of connections: with the default
+        queue (5), the connections dropped wait the retry of the client (1 s)
+        when many pages are loaded at the same time
+    """
+
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class ReplayServer ():
+    """ Local http server with the pages saved in an archive, to run the
+        scraper without internet: used as http proxy (PROXY_SERVER and
+        PROXY_PORT), with HOME_URL as http url. The sites keep their hosts,
+        so the domains and limits by host are the same of a live run
+    """
+
+    def __init__(self, archive: PageArchive, root_host: str = "",
+                 host: str = "127.0.0.1", port: int = 8765, latency: float = 0):
+        """ Create the server
+
+        Args:
+            archive (PageArchive): pages to serve
+            root_host (str, optional): host served in the root path (the catalog).
+                Defaults to "" (host of the first page saved).
+            host (str, optional): address to listen. Defaults to "127.0.0.1".
+            port (int, optional): port to listen (0 for a free port).
+                Defaults to 8765.
+            latency (float, optional): seconds to wait before each response,
+                to simulate a remote server. Defaults to 0.
+        """
+
+        self.archive = archive
+        self.latency = latency
+        self.hosts = archive.get_hosts()
+
+        if not root_host and archive.pages:
+            root_host = urlsplit(next(iter(archive.pages))).netloc
+        self.root_host = root_host.lower().removeprefix("www.")
+
+        self.server = ReplayHTTPServer((host, port), ReplayRequestHandler)
+        self.server.replay = self
+        self.thread = None
+
+    def get_url(self, path: str = "/") -> str:
+        """ Return the local url of a path of the catalog
+
+        Args:
+            path (str, optional): path of the page. Defaults to "/".
+
+        Returns:
+            str: local url
+        """
+
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def get_host_path(self, request_path: str, host_header: str = "") -> tuple:
+        """ Return the site and path of a request: proxy requests have the
+            full url, and the requests to the server itself are of the catalog
+
+        Args:
+            request_path (str): path of the request line
+            host_header (str, optional): value of the "Host" header. Defaults to "".
+
+        Returns:
+            tuple: host (without "www." and port) and path with query
+        """
+
+        host, path = host_header, request_path
+        if request_path.startswith(("http://", "https://")):
+            parts = urlsplit(request_path)
+            host = parts.netloc
+            path = parts.path or "/"
+            if parts.query:
+                path += f"?{parts.query}"
+
+        host = host.lower().split(":")[0].removeprefix("www.")
+        if not host or host in ("localhost", self.server.server_address[0]):
+            host = self.root_host
+        return host, path
+
+    def rewrite_url(self, url: str) -> str:
+        """ Return the http url of an url of the archive (the proxy can't
+            serve https), or the same url if it is from other site
+
+        Args:
+            url (str): url of a link or resource
+
+        Returns:
+            str: local url
+        """
+
+        parts = urlsplit(url)
+        if parts.scheme != "https":
+            return url
+
+        host = parts.netloc.lower().removeprefix("www.")
+        if host == self.root_host or host in self.hosts:
+            return f"http{url[len('https'):]}"
+        return url
+
+    def rewrite_html(self, html: str) -> str:
+        """ Remove scripts and point the links of the archived sites
+            to the proxy, as http urls
+
+        Args:
+            html (str): html of the page
+
+        Returns:
+            str: html to serve
+        """
+
+        html = SCRIPT_PATTERN.sub("", html)
+        return URL_ATTRIB_PATTERN.sub(
+            lambda match: match.group(1) + match.group(2) +
+            self.rewrite_url(match.group(3).strip()) + match.group(2),
+            html
+        )
+
+    def start(self):
+        """ Serve the pages in a background thread
+        """
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """ Stop the server
+        """
+
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a pages archive locally")
+    parser.add_argument("archive", help="path of the .jsonl.gz archive")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--root-host", default="")
+    parser.add_argument("--latency", type=float, default=0)
+    args = parser.parse_args()
+
+    replay_server = ReplayServer(
+        PageArchive(args.archive),
+        root_host=args.root_host,
+        port=args.port,
+        latency=args.latency,
+    )
+    print(f"Serving {args.archive} in {replay_server.get_url()} (use it as http proxy)")
+    replay_server.server.serve_forever()
@@ -0,0 +1,189 @@
+import time
+import sqlite3
+import argparse
+from libs.xlsx import SpreadsheetManager
+
+
+class ResultsStore ():
+    """ Save businesses, contacts and filters in a local sqlite database
+    """
+
+    def __init__(self, db_path: str):
+        """ Open (or create) the database and its tables
+
+        Args:
+            db_path (str): path of the sqlite file
+        """
+
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS businesses (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                links TEXT NOT NULL DEFAULT '',
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS contacts (
+                business_id INTEGER NOT NULL REFERENCES businesses (id),
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                UNIQUE (business_id, kind, value)
+            );
+            CREATE TABLE IF NOT EXISTS business_facets (
+                business_id INTEGER NOT NULL REFERENCES businesses (id),
+                province TEXT NOT NULL,
+                solution TEXT NOT NULL,
+                cnae TEXT NOT NULL,
+                UNIQUE (business_id, province, solution, cnae)
+            );
+            CREATE INDEX IF NOT EXISTS business_facets_combination
+                ON business_facets (province, solution, cnae);
+        """)
+        self.connection.commit()
+
+    def upsert_businesses(self, businesses: list):
+        """ Insert or update businesses, with its contacts and filters,
+            in a single transaction
+
+        Args:
+            businesses (list): businesses data
+
+            Example:
+            [
+                {
+                    "key": "name|domain",
+                    "name": "name",
+                    "links": "link1, link2",
+                    "province": "province",
+                    "solution": "solution",
+                    "cnae": "cnae",
+                    "emails": ["email1", ...],
+                    "phones": ["phone1", ...],
+                },
+                ...
+            ]
+        """
+
+        now = time.time()
+        with self.connection:
+            for business in businesses:
+
+                # Keep saved links if the new ones are empty
+                business_id = self.connection.execute("""
+                    INSERT INTO businesses (key, name, links, first_seen, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET
+                        links = CASE WHEN excluded.links != ''
+                            THEN excluded.links ELSE businesses.links END,
+                        updated_at = excluded.updated_at
+                    RETURNING id
+                """, (business["key"], business["name"], business["links"] or "",
+                      now, now)).fetchone()[0]
+
+                contacts = [(business_id, "email", email) for email in business["emails"]]
+                contacts += [(business_id, "phone", phone) for phone in business["phones"]]
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO contacts VALUES (?, ?, ?)",
+                    contacts
+                )
+
+                facet = (business["province"], business["solution"], business["cnae"])
+                if any(facet):
+                    self.connection.execute(
+                        "INSERT OR IGNORE INTO business_facets VALUES (?, ?, ?, ?)",
+                        (business_id, *facet)
+                    )
+
+    def count(self) -> int:
+        """ Return the number of businesses saved
+
+        Returns:
+            int: number of businesses
+        """
+
+        return self.connection.execute("SELECT COUNT(*) FROM businesses").fetchone()[0]
+
+    def iter_keys(self):
+        """ Read the keys of all businesses
+
+        Yields:
+            str: business key
+        """
+
+        for row in self.connection.execute("SELECT key FROM businesses"):
+            yield row[0]
+
+    def iter_rows(self):
+        """ Read all businesses as spreadsheet rows, with its filters and
+            contacts joined with ", "
+
+        Yields:
+            list: name, links, province, solution, cnae, emails and phones
+        """
+
+        joined_values = """
+            (SELECT GROUP_CONCAT({column}, ', ') FROM (
+                SELECT DISTINCT {column} FROM {table}
+                WHERE business_id = businesses.id {condition}
+            ))
+        """
+        columns = [
+            joined_values.format(column="province", table="business_facets", condition=""),
+            joined_values.format(column="solution", table="business_facets", condition=""),
+            joined_values.format(column="cnae", table="business_facets", condition=""),
+            joined_values.format(column="value", table="contacts",
+                                 condition="AND kind = 'email'"),
+            joined_values.format(column="value", table="contacts",
+                                 condition="AND kind = 'phone'"),
+        ]
+        query = f"""
+            SELECT businesses.name, businesses.links, {", ".join(columns)}
+            FROM businesses
+            ORDER BY businesses.id
+        """
+
+        for row in self.connection.execute(query):
+            yield [value or "" for value in row]
+
+    def export_xlsx(self, file_path: str, sheet_name: str, header: list):
+        """ Save all businesses in a sheet of an excel file, replacing its data
+
+        Args:
+            file_path (str): path of the excel file
+            sheet_name (str): name of the sheet
+            header (list): names of the columns
+        """
+
+        sheets = SpreadsheetManager(file_path)
+        sheets.create_set_sheet(sheet_name)
+        sheets.clear_sheet()
+        sheets.append_rows([header])
+        sheets.append_rows(self.iter_rows())
+        sheets.save()
+
+    def close(self):
+        """ Close the database
+        """
+
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the results database to excel")
+    parser.add_argument("database", help="path of the results .db file")
+    parser.add_argument("excel", help="path of the .xlsx file to save")
+    parser.add_argument("--sheet", default="Businesses")
+    args = parser.parse_args()
+
+    results_store = ResultsStore(args.database)
+    results_store.export_xlsx(
+        args.excel,
+        args.sheet,
+        ["name", "links", "province", "solution", "cnae", "emails", "phones"],
+    )
+    results_store.close()
+    print(f"Saved {args.excel}")
@@ -0,0 +1,82 @@
+import os
+import csv
+import time
+
+
+class StreamWriter ():
+    """ Append rows to a csv file, buffered in memory and flushed to disk
+        each some rows or seconds
+    """
+
+    def __init__(self, file_path: str, flush_rows: int = 50, flush_seconds: float = 30,
+                 on_flush: callable = None):
+        """ Save settings
+
+        Args:
+            file_path (str): path of the csv file
+            flush_rows (int, optional): Max rows in memory. Defaults to 50.
+            flush_seconds (float, optional): Max seconds between flushes.
+                Defaults to 30.
+            on_flush (callable, optional): function called after each flush,
+                when the rows are safe in disk. Defaults to None.
+        """
+
+        self.file_path = file_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.on_flush = on_flush
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def exists(self) -> bool:
+        """ Check if the csv file was already created
+
+        Returns:
+            bool: True if the file exists
+        """
+
+        return os.path.exists(self.file_path)
+
+    def write_rows(self, rows: list):
+        """ Add rows to the buffer, and flush it if it is full or old
+
+        Args:
+            rows (list): rows to write
+        """
+
+        self.buffer += rows
+
+        buffer_full = len(self.buffer) >= self.flush_rows
+        buffer_old = time.monotonic() - self.last_flush >= self.flush_seconds
+        if buffer_full or buffer_old:
+            self.flush()
+
+    def flush(self):
+        """ Write the buffered rows at the end of the file and force them to disk
+        """
+
+        if self.buffer:
+            with open(self.file_path, "a", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerows(self.buffer)
+                file.flush()
+                os.fsync(file.fileno())
+            self.buffer = []
+
+        self.last_flush = time.monotonic()
+        if self.on_flush:
+            self.on_flush()
+
+    def iter_rows(self):
+        """ Read the rows saved in the file
+
+        Yields:
+            list: values of each row
+        """
+
+        if not self.exists():
+            return
+
+        with open(self.file_path, "r", newline="", encoding="utf-8") as file:
+            for row in csv.reader(file):
+                yield row
@@ -0,0 +1,180 @@
+import heapq
+from urllib.parse import urlparse, urljoin, urldefrag
+
+# Words in link url or text, and its score (higher is visited first)
+CONTACT_KEYWORDS = {
+    "contacto": 10, "contact": 10, "contacta": 10, "contactar": 10,
+    "aviso-legal": 8, "aviso legal": 8, "legal": 6, "imprint": 6, "impressum": 6,
+    "quienes-somos": 4, "quienes somos": 4, "sobre-nosotros": 4, "about": 4,
+    "empresa": 3, "nosotros": 3, "ubicacion": 3, "donde": 3,
+    "privacidad": 2, "privacy": 2, "cookies": 1,
+}
+
+# Words of links without contact info
+SKIP_KEYWORDS = (
+    "blog", "noticias", "news", "producto", "product", "tienda", "shop",
+    "carrito", "cart", "login", "wp-content", "feed", "categoria",
+)
+
+SKIP_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".doc",
+    ".docx", ".xls", ".xlsx", ".mp4", ".mp3",
+)
+
+# Public suffixes with two labels, common in the businesses sites
+SECOND_LEVEL_SUFFIXES = (
+    "com.es", "org.es", "nom.es", "gob.es", "edu.es",
+    "co.uk", "org.uk", "com.mx", "com.ar", "com.br", "com.pt", "com.co",
+)
+
+
+def get_registrable_domain(url: str) -> str:
+    """ Return the registrable domain of an url (like "example.com" for
+        "https://shop.example.com/page")
+
+    Args:
+        url (str): url of the page
+
+    Returns:
+        str: registrable domain, or empty string if the url has no host
+    """
+
+    host = urlparse(url).netloc.lower().split("@")[-1].split(":")[0]
+    labels = [label for label in host.split(".") if label]
+    if len(labels) < 2:
+        return host
+
+    suffix_labels = 2 if ".".join(labels[-2:]) in SECOND_LEVEL_SUFFIXES else 1
+    return ".".join(labels[-suffix_labels - 1:])
+
+
+def is_page_url(url: str) -> bool:
+    """ Check if an url can be loaded as a html page (not an email, phone
+        or file link)
+
+    Args:
+        url (str): url of the link
+
+    Returns:
+        bool: True if the url is http or https and not a file
+    """
+
+    parts = urlparse(url)
+    if parts.scheme not in ("http", "https"):
+        return False
+    return not parts.path.lower().endswith(SKIP_EXTENSIONS)
+
+
+def score_link(url: str, text: str = "") -> int:
+    """ Return how likely a link is to have contact info, by the words
+        of its url path and text
+
+    Args:
+        url (str): url of the link
+        text (str, optional): text of the link. Defaults to "".
+
+    Returns:
+        int: score of the link, 0 or less if it should not be visited
+    """
+
+    path = urlparse(url).path.lower()
+    if path.endswith(SKIP_EXTENSIONS):
+        return 0
+
+    words = f"{path} {text.lower().strip()}"
+    if any(keyword in words for keyword in SKIP_KEYWORDS):
+        return 0
+
+    return max(
+        (score for keyword, score in CONTACT_KEYWORDS.items() if keyword in words),
+        default=0
+    )
+
+
+class SubpageCrawler ():
+    """ Search contact info in the subpages of a site, visiting first the
+        links that look like contact pages, with a max depth and pages by site
+    """
+
+    def __init__(self, get_page: callable, max_depth: int = 1, max_pages: int = 4):
+        """ Save settings
+
+        Args:
+            get_page (callable): function to get (emails, phones, anchors, status)
+                from an url. Anchors are dicts with "href" and "text"
+            max_depth (int, optional): Max clicks from the start page.
+                Defaults to 1.
+            max_pages (int, optional): Max subpages visited by site, without
+                the start page. Defaults to 4.
+        """
+
+        self.get_page = get_page
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+
+    def __add_links__(self, frontier: list, seen: set, anchors: list, base_url: str,
+                      domain: str, depth: int):
+        """ Add the contact-like links of the same site to the frontier
+
+        Args:
+            frontier (list): heap of (score, depth, order, url) to visit
+            seen (set): urls already in the frontier or visited
+            anchors (list): href and text of each link of the page
+            base_url (str): url of the page, to resolve relative links
+            domain (str): registrable domain of the site
+            depth (int): depth of the links
+        """
+
+        for anchor in anchors:
+            url = urldefrag(urljoin(base_url, anchor["href"] or "")).url
+            if not is_page_url(url):
+                continue
+            if url in seen or get_registrable_domain(url) != domain:
+                continue
+
+            score = score_link(url, anchor.get("text") or "")
+            if score <= 0:
+                continue
+
+            seen.add(url)
+            heapq.heappush(frontier, (-score, depth, len(seen), url))
+
+    def crawl(self, url: str, page: tuple = None) -> tuple:
+        """ Get contact info from a page and its best subpages, stopping when
+            an email and a phone are found
+
+        Args:
+            url (str): url of the start page
+            page (tuple, optional): emails, phones, anchors and status of the
+                start page, if it is already loaded. Defaults to None.
+
+        Returns:
+            tuple: emails, phones and status ("ok" or "error") of the start page
+        """
+
+        emails, phones, anchors, status = page or self.get_page(url)
+        if status == "error" or (emails and phones):
+            return emails, phones, status
+
+        domain = get_registrable_domain(url)
+        start_url = urldefrag(url).url
+        seen = {start_url, start_url.rstrip("/"), start_url.rstrip("/") + "/"}
+        frontier = []
+        self.__add_links__(frontier, seen, anchors, url, domain, 1)
+
+        visited = 0
+        while frontier and visited < self.max_pages:
+            _, depth, _, subpage_url = heapq.heappop(frontier)
+            visited += 1
+
+            new_emails, new_phones, new_anchors, _ = self.get_page(subpage_url)
+            emails += [email for email in new_emails if email not in emails]
+            phones += [phone for phone in new_phones if phone not in phones]
+            if emails and phones:
+                break
+
+            if depth < self.max_depth:
+                self.__add_links__(frontier, seen, new_anchors, subpage_url, domain,
+                                   depth + 1)
+
+        return emails, phones, status
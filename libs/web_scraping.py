@@ -1,15 +1,37 @@
 import os
 import time
 import zipfile
+from urllib.parse import urldefrag
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from libs.rate_limiter import RateLimiter
+from libs.page_archive import PageArchive
+from libs.profiler import timed
 
 current_file = os.path.basename(__file__)
 
+# Chrome arguments to skip each resource type (images also with prefs).
+# Not with url patterns: they are not anchored, and they also apply to the
+# pages (like "*.ico" to "www.iconsultores.es")
+RESOURCES_ARGUMENTS = {
+    "images": "--blink-settings=imagesEnabled=false",
+    "fonts": "--disable-remote-fonts",
+    "media": "--autoplay-policy=user-gesture-required",
+}
+
+# Url patterns of common trackers, ads and chats
+TRACKERS_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.*",
+    "*hotjar.com*", "*clarity.ms*", "*tiktok.com*", "*linkedin.com/px*",
+    "*youtube.com/embed*", "*tawk.to*", "*zopim.com*", "*cookiebot.com*",
+]
+
 
 class WebScraping ():
     """ Class to manage and configure web browser
@@ -26,7 +48,9 @@ class WebScraping ():
                  incognito: bool = False, experimentals: bool = True,
                  start_killing: bool = False, start_openning: bool = True,
                  width: int = 1280, height: int = 720,
-                 mute: bool = True):
+                 mute: bool = True, rate_limiter: RateLimiter = None,
+                 page_load_strategy: str = "normal", block_resources: list = [],
+                 block_urls: list = [], command_time_out: int = 0):
         
         """ Save settings and create a new instance of the web browser
 
@@ -48,6 +72,17 @@ class WebScraping ():
             width (int, optional): Width of the window. Defaults to 1280.
             height (int, optional): Height of the window. Defaults to 720.
             mute (bool, optional): Mute the audio of the window. Defaults to True.
+            rate_limiter (RateLimiter, optional): Control the speed of the pages
+                loaded by host. Defaults to None.
+            page_load_strategy (str, optional): When page loads end: "normal" (all
+                resources loaded), "eager" (html parsed) or "none". Defaults to "normal".
+            block_resources (list, optional): Resource types to skip: "images",
+                "fonts", "media" (without autoplay). Defaults to [].
+            block_urls (list, optional): Url patterns to skip, with "*" as
+                wildcard (like TRACKERS_PATTERNS). Defaults to [].
+            command_time_out (int, optional): Max seconds to wait the answer of
+                each browser command, to detect a hung browser (0 for no
+                limit). Defaults to 0.
         """
 
         self.basetime = 1
@@ -70,8 +105,18 @@ class WebScraping ():
         self.__width__ = width
         self.__height__ = height
         self.__mute__ = mute
+        self.__rate_limiter__ = rate_limiter
+        self.__page_load_strategy__ = page_load_strategy
+        self.__block_resources__ = block_resources
+        self.__blocked_urls__ = list(block_urls)
+        self.__blocked_tabs__ = set()
+        self.__command_time_out__ = command_time_out
+        self.__time_out__ = time_out
+        self.__navigations__ = 0
+        self.__tab_pool__ = None
         
         self.__web_page__ = None
+        self.__page_mark__ = ("", "")
 
         # Kill chrome from terminal
         if start_killing:
@@ -186,8 +231,19 @@ class WebScraping ():
             if self.__user_agent__:
                 WebScraping.options.add_argument(f'--user-agent={self.__user_agent__}')
 
+            # Load only the resources required
+            WebScraping.options.page_load_strategy = self.__page_load_strategy__
+            
+            for resource in self.__block_resources__:
+                if resource in RESOURCES_ARGUMENTS:
+                    WebScraping.options.add_argument(RESOURCES_ARGUMENTS[resource])
+            
+            prefs = {}
+            if "images" in self.__block_resources__:
+                prefs['profile.managed_default_content_settings.images'] = 2
+            
             if self.__download_folder__:
-                prefs = {
+                prefs.update({
                     'download.default_directory': f'{self.__download_folder__}',
                     'download.prompt_for_download': 'false',
                     'profile.default_content_setting_values.automatic_downloads': 1,
@@ -202,8 +258,9 @@ class WebScraping ():
                     ],
                     'download.extensions_to_open': 'xml',
                     'safebrowsing.enabled': True
-                }
+                })
 
+            if prefs:
                 WebScraping.options.add_experimental_option('prefs', prefs)
 
             if self.__extensions__:
@@ -218,28 +275,53 @@ class WebScraping ():
                     "--disable-blink-features=AutomationControlled"
                 )
         
-        # Setup proxy
-        if self.__proxy_server__ and self.__proxy_port__:
-            
-            # Setup user and password proxy
-            if self.__proxy_user__ and self.__proxy_pass__:
-                self.__create_proxy_extension__()
-                WebScraping.options.add_extension(self.__pluginfile__)
+            # Setup proxy (with the options, not again in each browser restart)
+            if self.__proxy_server__ and self.__proxy_port__:
                 
-            # Setup basic proxy
-            else:
-                proxy = f"{self.__proxy_server__}:{self.__proxy_port__}"
-                WebScraping.options.add_argument(f"--proxy-server={proxy}")
+                # Setup user and password proxy
+                if self.__proxy_user__ and self.__proxy_pass__:
+                    self.__create_proxy_extension__()
+                    WebScraping.options.add_extension(self.__pluginfile__)
+                    
+                # Setup basic proxy
+                else:
+                    proxy = f"{self.__proxy_server__}:{self.__proxy_port__}"
+                    WebScraping.options.add_argument(f"--proxy-server={proxy}")
 
         # Autoinstall driver with selenium
         if not WebScraping.service:
             WebScraping.service = Service()
+        
+        # Raise an error instead of wait forever a hung browser
+        if self.__command_time_out__ > 0:
+            RemoteConnection.set_timeout(self.__command_time_out__)
           
         # Auto download driver
         self.driver = webdriver.Chrome(
             service=WebScraping.service,
             options=WebScraping.options
         )
+        self.__blocked_tabs__ = set()
+        self.__block_urls_tab__()
+
+    def __block_urls_tab__(self):
+        """ Block the resources and urls in the current tab (the devtools
+            protocol settings are by tab), only once by tab
+        """
+
+        if not self.__blocked_urls__:
+            return
+
+        tab = self.driver.current_window_handle
+        if tab in self.__blocked_tabs__:
+            return
+
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd(
+            "Network.setBlockedURLs",
+            {"urls": self.__blocked_urls__}
+        )
+        self.__blocked_tabs__.add(tab)
 
     def __create_proxy_extesion__(self):
         """ Create a proxy chrome extension """
@@ -350,13 +432,31 @@ class WebScraping ():
 
         self.driver.quit()
 
-    def __reload_browser__(self):
+    def __reload_browser__(self, load_page: bool = True):
         """ Close the current instance of the web browser and reload in the same page
+        
+        Args:
+            load_page (bool, optional): load the last page in the new browser.
+                Defaults to True.
         """
 
-        self.end_browser()
-        self.driver = self.get_browser()
-        self.driver.get(self.__web_page__)
+        # The old session can be dead
+        try:
+            self.end_browser()
+        except Exception:
+            pass
+
+        # Each browser needs its own driver process
+        WebScraping.service = None
+        self.__set_browser_instance__()
+        if self.__time_out__ > 0:
+            self.driver.set_page_load_timeout(self.__time_out__)
+        self.__navigations__ = 0
+        self.__page_mark__ = ("", "")
+        self.__tab_pool__ = None
+
+        if load_page and self.__web_page__:
+            self.set_page(self.__web_page__)
 
     def send_data(self, selector: str, data: str):
         """ Send data to specific input fill
@@ -379,6 +479,7 @@ class WebScraping ():
         elem = self.driver.find_element(By.CSS_SELECTOR, selector)
         elem.click()
 
+    @timed("web.wait_load")
     def wait_load(self, selector: str, time_out: int = 10, refresh_back_tab: int = -1):
         """ Wait to page load an element
         
@@ -434,6 +535,156 @@ class WebScraping ():
                 error = f"Time out exeded. The element {selector} is until in the page"
                 raise Exception(error)
 
+    def wait_until(self, condition: callable, time_out: float = 10,
+                   poll_time: float = 0.05, max_poll_time: float = 0.5) -> bool:
+        """ Wait until a condition is true, checking it with adaptive polling:
+            fast at the start and slower each try, up to max_poll_time
+        
+        Args:
+            condition (callable): function without args that return True when ready.
+                Errors are handled as not ready
+            time_out (float): max seconds to wait
+            poll_time (float): seconds to wait after the first check
+            max_poll_time (float): max seconds to wait between checks
+            
+        Returns:
+            bool: True if the condition was meet, False if time out
+        """
+
+        end_time = time.monotonic() + time_out
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception:
+                pass
+
+            remaining_time = end_time - time.monotonic()
+            if remaining_time <= 0:
+                return False
+
+            time.sleep(min(poll_time, remaining_time))
+            poll_time = min(poll_time * 2, max_poll_time)
+
+    @timed("web.wait_ready")
+    def wait_ready(self, time_out: float = 10, state: str = "complete") -> bool:
+        """ Wait until the document reach a ready state
+        
+        Args:
+            time_out (float): max seconds to wait
+            state (str): "interactive" or "complete"
+            
+        Returns:
+            bool: True if the page is ready, False if time out
+        """
+
+        states = ["interactive", "complete"] if state == "interactive" else ["complete"]
+        return self.wait_until(
+            lambda: self.driver.execute_script("return document.readyState") in states,
+            time_out
+        )
+
+    @timed("web.wait_selector")
+    def wait_selector(self, selector: str, time_out: float = 10) -> bool:
+        """ Wait until an element is in the page
+        
+        Args:
+            selector (str): CSS selector of the element
+            time_out (float): max seconds to wait
+            
+        Returns:
+            bool: True if the element is in the page, False if time out
+        """
+
+        script = "return document.querySelector(arguments[0]) !== null;"
+        return self.wait_until(
+            lambda: self.driver.execute_script(script, selector),
+            time_out
+        )
+
+    @timed("web.wait_network_idle")
+    def wait_network_idle(self, idle_time: float = 0.5, time_out: float = 10,
+                          state: str = "complete") -> bool:
+        """ Wait until the page stop loading resources and ajax requests
+        
+        Args:
+            idle_time (float): seconds without new requests to consider the page idle
+            time_out (float): max seconds to wait
+            state (str): min ready state of the page: "interactive" (html parsed)
+                or "complete" (all resources loaded). Defaults to "complete".
+            
+        Returns:
+            bool: True if the network is idle, False if time out
+        """
+
+        script = """
+            const jqueryActive = window.jQuery ? window.jQuery.active : 0;
+            return [
+                document.readyState,
+                performance.getEntriesByType("resource").length,
+                jqueryActive
+            ];
+        """
+
+        states = ["interactive", "complete"] if state == "interactive" else ["complete"]
+        last_status = {"requests": -1, "time": time.monotonic()}
+
+        def is_idle() -> bool:
+            ready_state, requests, jquery_active = self.driver.execute_script(script)
+            now = time.monotonic()
+
+            # Restart idle time when new requests are found
+            if requests != last_status["requests"] or jquery_active > 0:
+                last_status["requests"] = requests
+                last_status["time"] = now
+                return False
+
+            return ready_state in states and now - last_status["time"] >= idle_time
+
+        return self.wait_until(is_idle, time_out)
+
+    def mark_page(self, selector: str = ""):
+        """ Save a mark of the current document and the content of an element,
+            used by wait_page_change to detect navigations or ajax updates
+        
+        Args:
+            selector (str): CSS selector of the element to watch (like a pager)
+        """
+
+        script = """
+            window.__webScrapingMark = true;
+            const elem = arguments[0] ? document.querySelector(arguments[0]) : null;
+            return elem ? elem.outerHTML : "";
+        """
+        content = self.driver.execute_script(script, selector)
+        self.__page_mark__ = (selector, content)
+
+    @timed("web.wait_page_change")
+    def wait_page_change(self, time_out: float = 10) -> bool:
+        """ Wait until the document marked with mark_page is replaced and loaded,
+            or the content of the watched element change
+        
+        Args:
+            time_out (float): max seconds to wait
+            
+        Returns:
+            bool: True if the page changed, False if time out
+        """
+
+        selector, content = self.__page_mark__
+        script = """
+            const [selector, content] = arguments;
+            if (!window.__webScrapingMark) return document.readyState === "complete";
+            if (!selector) return false;
+            const elem = document.querySelector(selector);
+            const jqueryActive = window.jQuery ? window.jQuery.active : 0;
+            return (elem ? elem.outerHTML : "") !== content && jqueryActive === 0;
+        """
+        return self.wait_until(
+            lambda: self.driver.execute_script(script, selector, content),
+            time_out
+        )
+
     def get_text(self, selector: str) -> str:
         """ Return text for specific element in the page
         
@@ -451,27 +702,25 @@ class WebScraping ():
             # print (err)
             return ""
 
-    def get_texts(self, selector: str) -> list:
-        """ Return a list of text for specific selector
+    def get_texts(self, selector: str, allow_duplicates: bool = True,
+                  allow_empty: bool = True) -> list:
+        """ Return a list of text for specific selector, in a single js call
         
         Args:
             selector (str): CSS selector of the elements
+            allow_duplicates (bool): allow duplicate values
+            allow_empty (bool): allow empty values
             
         Returns:
             list: list of texts
         """
 
-        texts = []
-
-        elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-        for elem in elems:
-            try:
-                texts.append(elem.text)
-            except Exception:
-                continue
-
-        return texts
+        values = self.query_values(
+            {"texts": (selector, None)},
+            allow_duplicates=allow_duplicates,
+            allow_empty=allow_empty
+        )
+        return values["texts"]
 
     def set_attrib(self, selector: str, attrib_name: str, attrib_value: str):
         """ Set a value in specific attribute of an element in the page
@@ -517,29 +766,74 @@ class WebScraping ():
             list: list of values of the attribute
         """
 
-        attributes = []
-        elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-        for elem in elems:
-
-            try:
-                attribute = elem.get_attribute(attrib_name)
-
-                # Skip duplicates in not duplicate mode
-                if not allow_duplicates and attribute in attributes:
-                    continue
-
-                # Skip empty results in not ampty mode
-                if not allow_empty and attribute.strip() == "":
-                    continue
+        values = self.query_values(
+            {"attribs": (selector, attrib_name)},
+            allow_duplicates=allow_duplicates,
+            allow_empty=allow_empty
+        )
+        return values["attribs"]
 
-                attributes.append(attribute)
+    @timed("web.query_values")
+    def query_values(self, queries: dict, allow_duplicates: bool = True,
+                     allow_empty: bool = True) -> dict:
+        """ Return texts or attributes of many selectors, in a single js call
+        
+        Args:
+            queries (dict): selector and attribute name (None for text) by key
+            allow_duplicates (bool): allow duplicate values
+            allow_empty (bool): allow empty values
+            
+            Example:
+            {
+                "emails": ('a[href^="mailto:"]', None),
+                "phones": ('a[href^="tel:"]', "href"),
+            }
+            
+        Returns:
+            dict: list of values by key
+            
+            Example:
+            {
+                "emails": ["email1", "email2", ...],
+                "phones": ["tel:phone1", "tel:phone2", ...],
+            }
+        """
 
-            except Exception:
-                continue
+        script = """
+            const [queries, allowDuplicates, allowEmpty] = arguments;
+            
+            // Same values as selenium: text, properties (resolved urls) or attributes
+            const getValue = (elem, attribName) => {
+                if (!attribName) return elem.innerText;
+                if (attribName === "class") return elem.className;
+                const value = elem[attribName];
+                if (value === undefined || value === null || typeof value === "object") {
+                    return elem.getAttribute(attribName);
+                }
+                return String(value);
+            };
+            
+            const results = {};
+            for (const [key, [selector, attribName]] of Object.entries(queries)) {
+                const values = [];
+                const found = new Set();
+                for (const elem of document.querySelectorAll(selector)) {
+                    const value = getValue(elem, attribName);
+                    if (!allowEmpty && (value === null || value.trim() === "")) continue;
+                    if (!allowDuplicates) {
+                        if (found.has(value)) continue;
+                        found.add(value);
+                    }
+                    values.push(value);
+                }
+                results[key] = values;
+            }
+            return results;
+        """
 
-        return attributes
+        return self.driver.execute_script(script, queries, allow_duplicates, allow_empty)
 
+    @timed("web.get_elem")
     def get_elem(self, selector: str) -> WebElement:
         """ Return an specific element in the page
         
@@ -553,6 +847,7 @@ class WebScraping ():
         elem = self.driver.find_element(By.CSS_SELECTOR, selector)
         return elem
 
+    @timed("web.get_elems")
     def get_elems(self, selector: str) -> list:
         """ Return a list of specific element in the page
         
@@ -585,6 +880,7 @@ class WebScraping ():
 
         self.driver.execute_script(script)
 
+    @timed("web.set_page")
     def set_page(self, web_page: str, time_out: int = 0, break_time_out: bool = False):
         """ Update the web page in browser
         
@@ -594,9 +890,15 @@ class WebScraping ():
             break_time_out (bool): break if time out
         """
 
+        # Wait the turn of the host
+        if self.__rate_limiter__:
+            self.__rate_limiter__.wait(web_page)
+        start_time = time.monotonic()
+
         try:
 
             self.__web_page__ = web_page
+            self.__navigations__ += 1
 
             # Save time out when is greader than 0
             if time_out > 0:
@@ -607,6 +909,10 @@ class WebScraping ():
         # Catch error in load page
         except Exception:
 
+            if self.__rate_limiter__:
+                latency = time.monotonic() - start_time
+                self.__rate_limiter__.record(web_page, latency, error=True)
+
             # Raise error
             if break_time_out:
                 raise Exception(f"Time out to load page: {web_page}")
@@ -614,7 +920,31 @@ class WebScraping ():
             # Ignore error
             else:
                 self.driver.execute_script("window.stop();")
+                return
+
+        # Save page speed and status, to adapt the host rate
+        if self.__rate_limiter__:
+            latency = time.monotonic() - start_time
+            error = self.get_status_code() >= 400
+            self.__rate_limiter__.record(web_page, latency, error=error)
+
+    def get_status_code(self) -> int:
+        """ Return the http status code of the current page
 
+        Returns:
+            int: status code, or 0 if it is not available
+        """
+
+        script = """
+            const navigation = performance.getEntriesByType("navigation")[0];
+            return navigation && navigation.responseStatus ? navigation.responseStatus : 0;
+        """
+        try:
+            return int(self.driver.execute_script(script))
+        except Exception:
+            return 0
+
+    @timed("web.click_js")
     def click_js(self, selector: str):
         """ Send click with js, for hiden elements
         
@@ -703,18 +1033,21 @@ class WebScraping ():
         frame = self.get_elem(frame_selector)
         self.driver.switch_to.frame(frame)
 
+    @timed("web.open_tab")
     def open_tab(self):
         """ Create new empty tab in browser
         """
 
         self.driver.execute_script("window.open('');")
 
+    @timed("web.close_tab")
     def close_tab(self):
         """ Clase the current tab in the browser
         """
 
         self.driver.close()
 
+    @timed("web.switch_to_tab")
     def switch_to_tab(self, index: int):
         """ Switch to specific number of tab
         
@@ -724,7 +1057,23 @@ class WebScraping ():
 
         windows = self.driver.window_handles
         self.driver.switch_to.window(windows[index])
+        self.__block_urls_tab__()
+
+    def get_tab_pool(self, size: int = 4):
+        """ Return the pool of tabs of the current browser (created the first time)
+        
+        Args:
+            size (int): number of tabs. Defaults to 4.
+            
+        Returns:
+            TabPool: pool of tabs
+        """
 
+        if not self.__tab_pool__ or self.__tab_pool__.driver is not self.driver:
+            self.__tab_pool__ = TabPool(self, size)
+        return self.__tab_pool__
+
+    @timed("web.refresh_selenium")
     def refresh_selenium(self, time_units: int = 1, back_tab: int = 0):
         """ Refresh the selenium data, creating and closing a new tab
         
@@ -747,14 +1096,26 @@ class WebScraping ():
         # Wait time
         time.sleep(self.basetime * time_units)
 
-    def save_page(self, file_html: os.path):
-        """ Save current page in local file
+    @timed("web.save_page")
+    def save_page(self, file_html: os.path = "", archive: PageArchive = None,
+                  url: str = ""):
+        """ Save current page in local file, or in a pages archive (to replay it later)
         
         Args:
-            file_html (os.path): path to save the html file
+            file_html (os.path): path to save the html file. Defaults to "".
+            archive (PageArchive): archive to save the page. Defaults to None.
+            url (str): url to save the page in archive. Defaults to "" (current url).
         """
         
         page_html = self.driver.page_source
+        
+        if archive:
+            status = self.get_status_code() or 200
+            archive.save(url or self.driver.current_url, page_html, status)
+        
+        if not file_html:
+            return
+        
         current_folder = os.path.dirname(__file__)
         page_file = open(os.path.join(
             current_folder, file_html), "w", encoding='utf-8')
@@ -802,4 +1163,115 @@ class WebScraping ():
         """
         
         script = f"window.localStorage.setItem('{key}', '{value}')"
-        self.driver.execute_script(script)
\ No newline at end of file
+        self.driver.execute_script(script)
+
+
+class TabPool ():
+    """ Fixed set of browser tabs, reused to load many pages at the same time
+        (without creating and closing a tab by page)
+    """
+
+    def __init__(self, browser: WebScraping, size: int = 4):
+        """ Open the tabs, as named windows of the current tab
+
+        Args:
+            browser (WebScraping): browser where the tabs are opened
+            size (int, optional): number of tabs. Defaults to 4.
+        """
+
+        self.browser = browser
+        self.driver = browser.driver
+        self.main_tab = self.driver.current_window_handle
+        self.tabs = []
+
+        for index in range(size):
+            known_tabs = set(self.driver.window_handles)
+            self.driver.execute_script(
+                "window.open('about:blank', arguments[0]);",
+                f"tab_pool_{index}"
+            )
+            new_tabs = [tab for tab in self.driver.window_handles if tab not in known_tabs]
+            if not new_tabs:
+                raise Exception("Tab of the pool blocked by the browser")
+
+            self.tabs.append(new_tabs[0])
+            self.driver.switch_to.window(new_tabs[0])
+            self.browser.__block_urls_tab__()
+
+        self.driver.switch_to.window(self.main_tab)
+
+    def load_pages(self, urls: list, state: str = "complete", time_out: float = 20,
+                   poll_time: float = 0.05):
+        """ Load the pages in the tabs at the same time (without waiting each
+            load), and switch to each tab when its page is ready
+
+        Args:
+            urls (list): urls of the html pages (http or https, not files:
+                they don't replace the document of the tab, and wait the time out)
+            state (str, optional): ready state of the loaded pages: "interactive"
+                or "complete". Defaults to "complete".
+            time_out (float, optional): max seconds to load each page. Defaults to 20.
+            poll_time (float, optional): seconds between checks of the tabs.
+                Defaults to 0.05.
+
+        Yields:
+            tuple: url and True if it was loaded (False if time out). The browser
+                is in the tab of the page until the next one is requested
+        """
+
+        # The mark is removed when the new page replaces the old one
+        load_script = """
+            window.__tabPoolLoading = true;
+            window.location.href = arguments[0];
+        """
+        ready_script = """
+            return !window.__tabPoolLoading && arguments[0].includes(document.readyState);
+        """
+        states = ["interactive", "complete"] if state == "interactive" else ["complete"]
+        rate_limiter = self.browser.__rate_limiter__
+
+        pending_urls = list(reversed(urls))
+        free_tabs = list(self.tabs)
+        busy_tabs = {}
+
+        try:
+            while pending_urls or busy_tabs:
+
+                # Start the next pages in the free tabs
+                while pending_urls and free_tabs:
+                    tab = free_tabs.pop()
+                    url = pending_urls.pop()
+                    if rate_limiter:
+                        rate_limiter.wait(url)
+                    self.driver.switch_to.window(tab)
+
+                    # Without fragment, to always load a new document
+                    self.driver.execute_script(load_script, urldefrag(url).url)
+                    self.browser.__web_page__ = url
+                    self.browser.__navigations__ += 1
+                    busy_tabs[tab] = (url, time.monotonic())
+
+                # Return the pages ready (or too slow)
+                found = False
+                for tab, (url, start_time) in list(busy_tabs.items()):
+                    self.driver.switch_to.window(tab)
+                    loaded = self.driver.execute_script(ready_script, states)
+                    latency = time.monotonic() - start_time
+                    if not loaded and latency < time_out:
+                        continue
+
+                    if not loaded:
+                        self.driver.execute_script("window.stop();")
+                    if rate_limiter:
+                        rate_limiter.record(url, latency, error=not loaded)
+
+                    del busy_tabs[tab]
+                    found = True
+                    yield url, loaded
+                    free_tabs.append(tab)
+
+                if not found:
+                    time.sleep(poll_time)
+
+        finally:
+            self.driver.switch_to.window(self.main_tab)
@@ -0,0 +1,105 @@
+import multiprocessing
+from queue import Empty
+
+
+def __process_main__(create_worker: callable, worker_args: tuple,
+                     tasks_queue: multiprocessing.Queue,
+                     results_queue: multiprocessing.Queue):
+    """ Main function of each process: run tasks until the stop signal
+
+    Args:
+        create_worker (callable): function to create the worker. Receive the
+            function to send results and the worker args. Return a function to
+            run each task
+        worker_args (tuple): extra args to create the worker
+        tasks_queue (multiprocessing.Queue): shared queue of tasks
+        results_queue (multiprocessing.Queue): shared queue of results
+    """
+
+    try:
+        run_task = create_worker(results_queue.put, *worker_args)
+        for task in iter(tasks_queue.get, None):
+            run_task(task)
+    finally:
+        results_queue.put(None)
+
+
+class WorkerPool ():
+    """ Run tasks in independent processes, sending all results to a single writer
+    """
+
+    def __init__(self, create_worker: callable, workers: int = 2, worker_args: tuple = ()):
+        """ Save settings
+
+        Args:
+            create_worker (callable): module level function to create each worker.
+                Receive the function to send results and the worker args, and
+                return a function to run each task
+            workers (int, optional): Number of processes. Defaults to 2.
+            worker_args (tuple, optional): extra args to create the workers.
+                Defaults to ().
+        """
+
+        self.create_worker = create_worker
+        self.workers = workers
+        self.worker_args = worker_args
+        self.context = multiprocessing.get_context("spawn")
+
+    def run(self, tasks: list, on_result: callable):
+        """ Run all tasks and wait until they end
+
+        Args:
+            tasks (list): picklable tasks to run
+            on_result (callable): function called in this process with each
+                result sent by the workers
+
+        Raises:
+            Exception: some workers died without finishing (like when the
+                worker function can't be imported in the new processes)
+        """
+
+        tasks_queue = self.context.Queue()
+        results_queue = self.context.Queue()
+        for task in tasks:
+            tasks_queue.put(task)
+        for _ in range(self.workers):
+            tasks_queue.put(None)
+
+        # Start processes
+        processes = []
+        for _ in range(self.workers):
+            process = self.context.Process(
+                target=__process_main__,
+                args=(self.create_worker, self.worker_args, tasks_queue, results_queue),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        # Write results until all workers end
+        running = self.workers
+        while running > 0:
+            try:
+                result = results_queue.get(timeout=5)
+            except Empty:
+
+                # Stop if the processes died without sending the end signal
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+
+            if result is None:
+                running -= 1
+                continue
+
+            on_result(result)
+
+        for process in processes:
+            process.join()
+
+        if running > 0:
+            exit_codes = [process.exitcode for process in processes]
+            raise Exception(
+                f"{running} of {self.workers} workers died without finishing "
+                f"their tasks (exit codes: {exit_codes})"
+            )
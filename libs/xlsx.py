@@ -1,19 +1,30 @@
 import openpyxl
 from openpyxl.styles import Font
+from libs.profiler import timed
 
 
 class SpreadsheetManager ():
     """ Manage local spread sheets
     """
 
-    def __init__(self, file_name):
+    def __init__(self, file_name, read_only: bool = False):
+        """ Open (or create) the workbook
+
+        Args:
+            file_name (str): Path of the excel file
+            read_only (bool, optional): Open the file only to read, faster and
+                with less memory, without creating it. Defaults to False.
+        """
 
         self.file_name = file_name
-        try:
-            self.wb = openpyxl.load_workbook(self.file_name)
-        except Exception:
-            self.wb = openpyxl.Workbook()
-            self.wb.save(filename=self.file_name)
+        if read_only:
+            self.wb = openpyxl.load_workbook(self.file_name, read_only=True)
+        else:
+            try:
+                self.wb = openpyxl.load_workbook(self.file_name)
+            except Exception:
+                self.wb = openpyxl.Workbook()
+                self.wb.save(filename=self.file_name)
         self.current_sheet = None
 
     def get_sheets(self) -> list:
@@ -65,12 +76,19 @@ class SpreadsheetManager ():
 
         self.current_sheet = self.wb[sheet_name]
 
+    @timed("xlsx.save")
     def save(self):
         """ Save current workbook
         """
 
         self.wb.save(self.file_name)
 
+    def close(self):
+        """ Close current workbook (required to release read only files)
+        """
+
+        self.wb.close()
+
     def write_cell(self, value: str = "", row: int = 1, column: int = 1):
         """ Write a value in a specific cell
 
@@ -82,6 +100,7 @@ class SpreadsheetManager ():
 
         self.current_sheet.cell(row, column).value = value
 
+    @timed("xlsx.write_data")
     def write_data(self, data: list = [], start_row: int = 1, start_column: int = 1):
         """ Write a matrix of data in the current sheet
 
@@ -109,6 +128,24 @@ class SpreadsheetManager ():
             current_column = start_column
             current_row += 1
 
+    @timed("xlsx.append_rows")
+    def append_rows(self, rows):
+        """ Write rows after the last row of the current sheet, faster than
+        write_data for large amounts of data
+
+        Args:
+            rows (iterable): Rows of data
+        """
+
+        for row in rows:
+            self.current_sheet.append(row)
+
+    def clear_sheet(self):
+        """ Delete all rows of the current sheet
+        """
+
+        self.current_sheet.delete_rows(1, self.current_sheet.max_row)
+
     def auto_width(self):
         """ Set corect width to each coumn in the current sheet
         """
@@ -159,17 +196,32 @@ class SpreadsheetManager ():
     def get_data(self):
         """ Get all data from the current page """
 
-        rows = self.current_sheet.max_row
-        columns = self.current_sheet.max_column
+        return list(map(list, self.iter_data()))
 
-        data = []
-        for row in range(1, rows + 1):
+    def iter_data(self, columns: list = None, min_row: int = 1):
+        """ Read rows from the current sheet, one by one, only with specific columns
 
-            row_data = []
-            for column in range(1, columns + 1):
-                cell_data = self.current_sheet.cell(row, column).value
-                row_data.append(cell_data)
+        Args:
+            columns (list, optional): Column numbers to read. Defaults to None (all).
+            min_row (int, optional): Row number to start reading. Defaults to 1.
 
-            data.append(row_data)
+        Yields:
+            tuple: values of the columns in each row
+        """
 
-        return data
+        if not columns:
+            yield from self.current_sheet.iter_rows(min_row=min_row, values_only=True)
+            return
+
+        min_column = min(columns)
+        max_column = max(columns)
+        positions = [column - min_column for column in columns]
+        rows = self.current_sheet.iter_rows(
+            min_row=min_row,
+            min_col=min_column,
+            max_col=max_column,
+            values_only=True
+        )
+        for row in rows:
+            row = tuple(row) + (None,) * (max_column - min_column + 1 - len(row))
+            yield tuple(row[position] for position in positions)
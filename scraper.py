@@ -0,0 +1,1552 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse, urlunparse, parse_qs, parse_qsl, urlencode
+from dotenv import load_dotenv
+from libs.web_scraping import WebScraping, TRACKERS_PATTERNS
+from libs.xlsx import SpreadsheetManager
+from libs.http_fetch import HttpFetcher, parse_anchors, parse_listing
+from libs.contact_resolver import ContactResolver
+from libs.worker_pool import WorkerPool
+from libs.rate_limiter import RateLimiter
+from libs.contact_cache import ContactCache
+from libs.progress_journal import ProgressJournal
+from libs.dedupe_index import DedupeIndex
+from libs.stream_writer import StreamWriter
+from libs.results_store import ResultsStore
+from libs.subpage_crawler import SubpageCrawler, is_page_url
+from libs.contact_extractor import extract_contacts
+from libs.page_archive import PageArchive
+from libs.profiler import PROFILER, timed
+from libs.metrics import METRICS
+from libs.browser_supervisor import BrowserSupervisor, BrowserRestartRequired
+
+# Env variables
+load_dotenv()
+USE_FILTERS = os.getenv("USE_FILTERS", "False") == "True"
+EXPLORE_SUBPAGES = os.getenv("EXPLORE_SUBPAGES", "False") == "True"
+SUBPAGES_MAX_DEPTH = int(os.getenv("SUBPAGES_MAX_DEPTH", "1"))
+SUBPAGES_MAX_PAGES = int(os.getenv("SUBPAGES_MAX_PAGES", "4"))
+HOME_URL = os.getenv("HOME_URL")
+HEADLESS = os.getenv("HEADLESS", "True") == "True"
+FETCH_ENGINE = os.getenv("FETCH_ENGINE", "selenium")
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "20"))
+MAX_PER_HOST = int(os.getenv("MAX_PER_HOST", "2"))
+REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "20"))
+WORKERS = int(os.getenv("WORKERS", "1"))
+CATALOG_RATE = float(os.getenv("CATALOG_RATE", "1"))
+CATALOG_MAX_RATE = float(os.getenv("CATALOG_MAX_RATE", "4"))
+SITES_RATE = float(os.getenv("SITES_RATE", "2"))
+SITES_MAX_RATE = float(os.getenv("SITES_MAX_RATE", "10"))
+USE_CACHE = os.getenv("USE_CACHE", "True") == "True"
+CACHE_TTL_HOURS = float(os.getenv("CACHE_TTL_HOURS", "720"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100000"))
+OUTPUT = os.getenv("OUTPUT", "stream")
+EXPORT_XLSX = os.getenv("EXPORT_XLSX", "False") == "True"
+FLUSH_ROWS = int(os.getenv("FLUSH_ROWS", "50"))
+FLUSH_SECONDS = float(os.getenv("FLUSH_SECONDS", "30"))
+PRUNE_FILTERS = os.getenv("PRUNE_FILTERS", "True") == "True"
+FILTER_NAVIGATION = os.getenv("FILTER_NAVIGATION", "url")
+PARALLEL_PAGES = int(os.getenv("PARALLEL_PAGES", "1"))
+RECORD_PAGES = os.getenv("RECORD_PAGES", "False") == "True"
+PROXY_SERVER = os.getenv("PROXY_SERVER", "")
+PROXY_PORT = os.getenv("PROXY_PORT", "")
+DATA_FOLDER = os.getenv("DATA_FOLDER", "")
+PROFILE = os.getenv("PROFILE", "False") == "True"
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+METRICS_INTERVAL = float(os.getenv("METRICS_INTERVAL", "15"))
+PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY", "eager")
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "images,fonts,media")
+BLOCK_TRACKERS = os.getenv("BLOCK_TRACKERS", "True") == "True"
+PAGE_TIMEOUT = int(os.getenv("PAGE_TIMEOUT", "60"))
+BROWSER_COMMAND_TIMEOUT = int(os.getenv("BROWSER_COMMAND_TIMEOUT", "120"))
+BROWSER_MAX_NAVIGATIONS = int(os.getenv("BROWSER_MAX_NAVIGATIONS", "500"))
+BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", "2048"))
+TASK_RETRIES = int(os.getenv("TASK_RETRIES", "2"))
+TAB_POOL_SIZE = int(os.getenv("TAB_POOL_SIZE", "4"))
+
+# Measure the time of each stage and browser command
+PROFILER.enabled = PROFILE
+
+
+class Scraper(WebScraping):
+    
+    def __init__(self, send_results: callable = None):
+        """ Start browser and load home page
+        
+        Args:
+            send_results (callable, optional): function to send the rows of each
+                page to the writer process, instead of saving them in the
+                spreadsheet (worker mode). Defaults to None.
+        """
+        
+        # Pages
+        self.home = HOME_URL
+        
+        # Http proxy, also used by the http clients (like the replay server)
+        self.proxy_url = ""
+        if PROXY_SERVER and PROXY_PORT:
+            self.proxy_url = f"http://{PROXY_SERVER}:{PROXY_PORT}"
+        
+        # Requests speed by host: catalog and business sites budgets
+        catalog_host = urlparse(self.home).netloc.lower()
+        self.rate_limiter = RateLimiter(
+            rate=SITES_RATE,
+            max_rate=SITES_MAX_RATE,
+            hosts={
+                catalog_host: {"rate": CATALOG_RATE, "max_rate": CATALOG_MAX_RATE},
+            },
+        )
+        
+        # Initialize and load home page
+        super().__init__(
+            headless=HEADLESS,
+            proxy_server=PROXY_SERVER,
+            proxy_port=PROXY_PORT,
+            rate_limiter=self.rate_limiter,
+            page_load_strategy=PAGE_LOAD_STRATEGY,
+            block_resources=[resource.strip() for resource in BLOCK_RESOURCES.split(",")
+                             if resource.strip()],
+            block_urls=TRACKERS_PATTERNS if BLOCK_TRACKERS else [],
+            time_out=PAGE_TIMEOUT,
+            command_time_out=BROWSER_COMMAND_TIMEOUT,
+        )
+        
+        # Restart the browser when it uses too much memory or hangs
+        self.supervisor = BrowserSupervisor(
+            self,
+            max_navigations=BROWSER_MAX_NAVIGATIONS,
+            max_rss_mb=BROWSER_MAX_RSS_MB,
+        )
+        self.task_page = 0
+        
+        # Files paths
+        self.current_folder = DATA_FOLDER or os.path.dirname(os.path.abspath(__file__))
+        self.filters_path = os.path.join(self.current_folder, "filters.json")
+        self.facets_path = os.path.join(self.current_folder, "facets.json")
+        self.sheets_path = os.path.join(self.current_folder, "data.xlsx")
+        self.cache_path = os.path.join(self.current_folder, "cache.db")
+        self.journal_path = os.path.join(self.current_folder, "progress.jsonl")
+        self.index_path = os.path.join(self.current_folder, "businesses.idx")
+        stream_name = "data_filters.csv" if USE_FILTERS else "data_businesses.csv"
+        self.stream_path = os.path.join(self.current_folder, stream_name)
+        self.results_path = os.path.join(self.current_folder, "results.db")
+        self.archive_path = os.path.join(self.current_folder, "pages.jsonl.gz")
+        self.trace_path = os.path.join(self.current_folder, "trace.jsonl")
+        self.sheet_name = "businesses filters" if USE_FILTERS else "Businesses"
+        
+        # Save the pages visited, to replay the run without internet
+        self.archive = None
+        if RECORD_PAGES:
+            self.archive = PageArchive(self.archive_path, load=False)
+        self.__load_home_page__()
+        
+        # Spreadsheet manager and progress (only the writer process use them)
+        self.send_results = send_results
+        self.sheets = None
+        self.journal = None
+        self.stream = None
+        self.results_store = None
+        self.pending_progress = []
+        self.pending_rows = 0
+        self.rows_written = 0
+        self.filters_pending = 0
+        self.current_row = 1
+        self.task_key = ""
+        self.tasks_keys = []
+        if not self.send_results:
+            self.journal = ProgressJournal(self.journal_path)
+            
+            # Workbook always open only when rows are saved in it directly
+            if OUTPUT == "xlsx":
+                self.sheets = self.__open_sheets__()
+            
+            # Rows saved in a csv while running, and in excel at the end
+            if OUTPUT == "stream":
+                self.stream = StreamWriter(
+                    self.stream_path,
+                    flush_rows=FLUSH_ROWS,
+                    flush_seconds=FLUSH_SECONDS,
+                    on_flush=self.__save_progress__,
+                )
+            
+            # Rows saved in a sqlite database, and in excel at the end
+            if OUTPUT == "sqlite":
+                self.results_store = ResultsStore(self.results_path)
+        
+        # Columns of the output data
+        self.header = ["name", "links", "province", "solution", "cnae", "emails", "phones"]
+        
+        # Css global selectors
+        self.global_selectors = {
+            "wrappers": {
+                "solutions": '.block-facet-blocktipo-solucion-kit-digital',
+                "provinces": '.block-facet-blockprovincia-opera-digitalizador',
+                "cnae": '.block-facet-blockcnae-opera-digitalizador',
+            },
+            "filter_elem": '.facet-item a span',
+            "filter_link": '.facet-item a',
+        }
+        
+        # Http client for listing pages, loading many pages at once
+        self.pages_fetcher = None
+        self.pages_executor = None
+        if PARALLEL_PAGES > 1:
+            self.pages_fetcher = HttpFetcher(
+                time_out=REQUEST_TIMEOUT,
+                pool_size=PARALLEL_PAGES,
+                rate_limiter=self.rate_limiter,
+                archive=self.archive,
+                proxy_url=self.proxy_url,
+            )
+            self.pages_executor = ThreadPoolExecutor(max_workers=PARALLEL_PAGES)
+        
+        # Url param of each filter, by category
+        self.facets_params = None
+        
+        # Current filters
+        self.province = ""
+        self.solution = ""
+        self.cnae = ""
+        
+        # Already scraped data
+        self.businesses_index = DedupeIndex(ignore_hosts=[catalog_host])
+        
+        # Contact info of the pages already visited
+        self.contact_cache = None
+        if USE_CACHE:
+            self.contact_cache = ContactCache(
+                self.cache_path,
+                ttl_hours=CACHE_TTL_HOURS,
+                max_entries=CACHE_MAX_ENTRIES,
+            )
+        
+        # Search contact info in the subpages of each business site
+        self.subpage_crawler = None
+        contact_time_out = REQUEST_TIMEOUT
+        if EXPLORE_SUBPAGES:
+            self.subpage_crawler = SubpageCrawler(
+                self.__get_page_contacts__,
+                max_depth=SUBPAGES_MAX_DEPTH,
+                max_pages=SUBPAGES_MAX_PAGES,
+            )
+            contact_time_out = REQUEST_TIMEOUT * (SUBPAGES_MAX_PAGES + 1)
+        
+        # Http client for business pages, loading all links of each page at once
+        self.http_fetcher = None
+        self.contact_resolver = None
+        if FETCH_ENGINE == "http":
+            self.http_fetcher = HttpFetcher(
+                time_out=REQUEST_TIMEOUT,
+                pool_size=MAX_PER_HOST,
+                rate_limiter=self.rate_limiter,
+                archive=self.archive,
+                proxy_url=self.proxy_url,
+            )
+            self.contact_resolver = ContactResolver(
+                self.__get_contact_info__,
+                max_concurrency=MAX_CONCURRENCY,
+                max_per_host=MAX_PER_HOST,
+                time_out=contact_time_out,
+            )
+        
+    def __open_sheets__(self) -> SpreadsheetManager:
+        """ Open excel file and create (if not exists) the sheet of the data
+        
+        Returns:
+            SpreadsheetManager: spreadsheet manager with the data sheet selected
+        """
+        
+        sheets = SpreadsheetManager(self.sheets_path)
+        sheets.create_set_sheet(self.sheet_name)
+        return sheets
+    
+    def __iter_sheet_data__(self, columns: list = None):
+        """ Read rows saved in the data sheet, in read only mode
+        
+        Args:
+            columns (list, optional): column numbers to read. Defaults to None (all).
+            
+        Yields:
+            tuple: values of each row
+        """
+        
+        if not os.path.exists(self.sheets_path):
+            return
+        
+        sheets = SpreadsheetManager(self.sheets_path, read_only=True)
+        try:
+            if self.sheet_name not in sheets.get_sheets():
+                return
+            sheets.set_sheet(self.sheet_name)
+            yield from sheets.iter_data(columns)
+        finally:
+            sheets.close()
+    
+    def __clean_list__(self, items: list) -> list:
+        """ Remove empty elements and duplicated from list
+        
+        Args:
+            items (list): list of items to clean
+            
+        Returns:
+            list: cleaned list
+        """
+
+        # Without changing the order (used by the businesses keys)
+        items = list(filter(lambda item: isinstance(item, str), items))
+        items = list(dict.fromkeys(items))
+        items = list(filter(lambda item: item != "" and item is not None, items))
+        return items
+        
+    @timed("scraper.load_home_page")
+    def __load_home_page__(self):
+        """ Load home page """
+        
+        self.__load_catalog_page__(self.home)
+    
+    def __load_catalog_page__(self, url: str):
+        """ Load a page of the catalog, waiting its facets (loaded by ajax)
+        
+        Args:
+            url (str): url of the page
+        """
+        
+        self.set_page(url)
+        self.wait_ready()
+        self.wait_network_idle()
+        self.__record_page__()
+    
+    def __record_page__(self, url: str = ""):
+        """ Save the current page in the pages archive, if recording
+        
+        Args:
+            url (str, optional): url to save the page. Defaults to "" (current url).
+        """
+        
+        if self.archive:
+            self.save_page(archive=self.archive, url=url)
+        
+    def __get_filters__(self) -> dict:
+        """ Get filters from the page
+
+        Returns:
+            dict: filters with id and name by category
+            
+            Example:
+            {
+                "solutions": [...]
+                "provinces": [...]
+                "cnae": [...]
+            }
+        """
+        
+        print("Getting filters...")
+                
+        # Loop wrappers
+        items = {}
+        for wrapper_name in self.global_selectors["wrappers"]:
+            facets = self.__get_facets__(wrapper_name)
+            items[wrapper_name] = [facet["name"] for facet in facets if facet["name"]]
+        
+        return items
+    
+    def __get_facets__(self, wrapper_name: str) -> list:
+        """ Get the filters of a category, with its results count and link,
+            in a single js call
+        
+        Args:
+            wrapper_name (str): filters category: solutions, provinces or cnae
+            
+        Returns:
+            list: filters data. Count is None if the page doesn't show it
+            
+            Example:
+            [
+                {
+                    "name": "name",
+                    "count": 10,
+                    "url": "https://...?f[0]=...",
+                },
+                ...
+            ]
+        """
+        
+        script = """
+            const [selectorLinks] = arguments;
+            return Array.from(document.querySelectorAll(selectorLinks), link => {
+                const valueElem = link.querySelector(".facet-item__value, span");
+                const countElem = link.querySelector(".facet-item__count");
+                let count = link.dataset.drupalFacetItemCount;
+                if (count === undefined && countElem) {
+                    count = countElem.innerText.replace(/\\D/g, "");
+                }
+                return {
+                    name: (valueElem || link).innerText.trim(),
+                    count: count ? parseInt(count) : (count === undefined ? null : 0),
+                    url: link.href,
+                };
+            });
+        """
+        wrapper_selector = self.global_selectors["wrappers"][wrapper_name]
+        selector_links = f"{wrapper_selector} {self.global_selectors['filter_link']}"
+        return self.driver.execute_script(script, selector_links)
+    
+    def __plan_filters_combinations__(self) -> list:
+        """ Get only the filters combinations with results, reading the results
+            count of each filter: provinces, then solutions of each province, then
+            cnae of each province and solution
+        
+        Returns:
+            list: filters combinations with results count
+        """
+        
+        print("Planning filters combinations with results...")
+        
+        combinations = []
+        self.__load_home_page__()
+        for province in self.__get_facets__("provinces"):
+            if province["count"] == 0:
+                continue
+            
+            print(f"\tGetting filters of province {province['name']}...")
+            self.__load_catalog_page__(province["url"])
+            for solution in self.__get_facets__("solutions"):
+                if solution["count"] == 0:
+                    continue
+                
+                self.__load_catalog_page__(solution["url"])
+                for cnae in self.__get_facets__("cnae"):
+                    if cnae["count"] == 0:
+                        continue
+                    
+                    combinations.append({
+                        "province": province["name"],
+                        "solution": solution["name"],
+                        "cnae": cnae["name"],
+                        "count": cnae["count"],
+                    })
+        
+        return combinations
+    
+    def __get_facets_params__(self) -> dict:
+        """ Get (and save in a json file) the url param of each filter, reading
+            the filters links of the home page only once
+        
+        Returns:
+            dict: url param by filter name and category
+            
+            Example:
+            {
+                "provinces": {"name": "provincia_opera_digitalizador:28", ...},
+                "solutions": {...},
+                "cnae": {...},
+            }
+        """
+        
+        if self.facets_params is not None:
+            return self.facets_params
+        
+        # Return data if file exists
+        if os.path.exists(self.facets_path):
+            with open(self.facets_path, "r", encoding="utf-8") as file:
+                self.facets_params = json.load(file)
+                return self.facets_params
+        
+        print("Getting filters urls...")
+        self.__load_home_page__()
+        self.facets_params = {}
+        for wrapper_name in self.global_selectors["wrappers"]:
+            params = {}
+            for facet in self.__get_facets__(wrapper_name):
+                query = parse_qs(urlparse(facet["url"]).query)
+                values = [value for key, value in query.items() if key.startswith("f[")]
+                if facet["name"] and len(values) == 1:
+                    params[facet["name"]] = values[0][0]
+            self.facets_params[wrapper_name] = params
+        
+        with open(self.facets_path, "w", encoding="utf-8") as file:
+            json.dump(self.facets_params, file, indent=4, ensure_ascii=False)
+            
+        return self.facets_params
+    
+    def __get_filter_url__(self) -> str:
+        """ Build the url of the results page with the current filters
+        
+        Returns:
+            str: results url, or empty string if some filter param is unknown
+        """
+        
+        facets_params = self.__get_facets_params__()
+        filters_values = {
+            "provinces": self.province,
+            "solutions": self.solution,
+            "cnae": self.cnae,
+        }
+        
+        query = []
+        for wrapper_name, filter_value in filters_values.items():
+            param = facets_params.get(wrapper_name, {}).get(filter_value)
+            if not param:
+                return ""
+            query.append((f"f[{len(query)}]", param))
+        
+        url_parts = urlparse(self.home)
+        query = parse_qsl(url_parts.query) + query
+        return urlunparse(url_parts._replace(query=urlencode(query)))
+    
+    def __set_filter__(self) -> bool:
+        """ Click in filters using the id
+            
+        Returns:
+            bool: True if filters were clicked, False otherwise
+        """
+        
+        selectors_wrappers = self.global_selectors["wrappers"]
+        filters_selectors_values = {
+            selectors_wrappers["provinces"]: self.province,
+            selectors_wrappers["solutions"]: self.solution,
+            selectors_wrappers["cnae"]: self.cnae,
+        }
+        
+        filters_found = 0
+        for filter_wrapper_selector, filter_value in filters_selectors_values.items():
+            
+            # Loop filter elements and click by value
+            selector_elem = self.global_selectors['filter_elem']
+            selector_filter = f"{filter_wrapper_selector} {selector_elem}"
+            filter_elems = self.get_elems(selector_filter)
+            
+            for filter_elem in filter_elems:
+                if filter_elem.text == filter_value:
+                    
+                    # Click with js (manually) and wait to results update
+                    self.mark_page(".view-content")
+                    script = "arguments[0].click();"
+                    self.driver.execute_script(script, filter_elem)
+                    self.wait_page_change()
+                    
+                    filters_found += 1
+                    break
+                
+        # Validate filters found
+        if filters_found < 3:
+            return False
+            
+        return True
+    
+    def __get_cached_contact_info__(self, link: str) -> tuple:
+        """ Return the contact info saved of a page
+        
+        Args:
+            link (str): link of the page
+            
+        Returns:
+            tuple: emails and phones, or None if the page is not in cache
+        """
+        
+        if not self.contact_cache:
+            return None
+        
+        cached = self.contact_cache.get(link)
+        if cached:
+            METRICS.inc("scraper_contact_cache_hits_total")
+        else:
+            METRICS.inc("scraper_contact_cache_misses_total")
+        return cached
+    
+    @timed("scraper.get_contact_info")
+    def __get_contact_info__(self, link: str, page: tuple = None) -> tuple:
+        """ Get contact info from a page: email and phone
+            And search in subpages. Use the saved data if the page was
+            already visited
+        
+        Args:
+            link (str): link to search contact info
+            page (tuple, optional): emails, phones, links and status of the
+                page, if it is already loaded. Defaults to None.
+            
+        Returns:
+            tuple: emails and phones found in page and subpages
+            
+            Example:
+            (
+                ["email1", "email2", ...],
+                ["phone1", "phone2", ...]
+            )
+        """
+        
+        if page is None:
+            cached = self.__get_cached_contact_info__(link)
+            if cached:
+                return cached
+        
+        link_short = link[0:20] if len(link) > 20 else link
+        print(f"\t\tSearching contact info in page {link_short}...")
+        
+        if self.subpage_crawler:
+            emails, phones, status = self.subpage_crawler.crawl(link, page)
+        else:
+            emails, phones, _, status = page or self.__get_page_contacts__(link)
+        METRICS.inc("scraper_contact_fetches_total", labels={"status": status})
+        
+        if self.contact_cache:
+            self.contact_cache.set(link, emails, phones, status)
+        
+        return emails, phones
+    
+    def __get_page_contacts__(self, link: str) -> tuple:
+        """ Get contact info and links from a single page, with the current engine
+        
+        Args:
+            link (str): link to search contact info
+            
+        Returns:
+            tuple: emails, phones, links (href and text) and status
+                ("ok" or "error") of the page
+        """
+        
+        if self.http_fetcher:
+            return self.__get_contact_info_http__(link)
+        return self.__get_contact_info_browser__(link)
+    
+    def __get_contact_info_browser__(self, link: str) -> tuple:
+        """ Get contact info from a page: email and phone
+            Loading the page in the current tab
+        
+        Args:
+            link (str): link to search contact info
+            
+        Returns:
+            tuple: emails, phones, links and status ("ok" or "error") of the page
+        """
+        
+        # Set page (only the html is required, without all resources)
+        self.set_page(link)
+        self.wait_ready(state=self.__get_ready_state__())
+        
+        return self.__read_page_contacts__(link)
+    
+    def __get_ready_state__(self) -> str:
+        """ Return the ready state to wait in the business pages
+        
+        Returns:
+            str: "complete" with the normal load strategy, "interactive" otherwise
+        """
+        
+        return "complete" if PAGE_LOAD_STRATEGY == "normal" else "interactive"
+    
+    def __read_page_contacts__(self, link: str) -> tuple:
+        """ Get contact info and links from the page loaded in the current tab
+        
+        Args:
+            link (str): link of the page
+            
+        Returns:
+            tuple: emails, phones, links and status ("ok" or "error") of the page
+        """
+        
+        self.wait_network_idle(time_out=5, state=self.__get_ready_state__())
+        
+        # Pages not loaded (chrome error pages, like dns errors, have no status)
+        status_code = self.get_status_code()
+        page_error = self.driver.current_url.startswith("chrome-error://")
+        status = "error" if page_error or not status_code or status_code >= 400 else "ok"
+        self.__record_page__(link)
+        
+        # Get subpages (url and text of each one) and page html in a single call
+        values = self.query_values(
+            {
+                "links": ("a", "href"),
+                "links_texts": ("a", None),
+                "html": ("html", "outerHTML"),
+            }
+        )
+        links = [
+            {"href": href, "text": text or ""}
+            for href, text in zip(values["links"], values["links_texts"])
+            if href
+        ]
+        
+        # Search emails and phones in links and texts
+        emails, phones = extract_contacts("".join(values["html"]))
+        
+        return emails, phones, links, status
+    
+    def __get_contact_info_http__(self, link: str) -> tuple:
+        """ Get contact info from a page: email and phone
+            Reading the html, without the browser
+        
+        Args:
+            link (str): link to search contact info
+            
+        Returns:
+            tuple: emails, phones, links and status ("ok" or "error") of the page
+        """
+        
+        html = self.http_fetcher.get_html(link)
+        if not html:
+            return [], [], [], "error"
+        
+        links = parse_anchors(html)
+        emails, phones = extract_contacts(html)
+        
+        return emails, phones, links, "ok"
+        
+    @timed("scraper.get_contacts")
+    def __get_contacts__(self, links: list) -> dict:
+        """ Get contact info from a list of links
+            At the same time with the http engine, or in the pool of tabs
+            with the browser
+        
+        Args:
+            links (list): links to search contact info
+            
+        Returns:
+            dict: emails and phones by link
+            
+            Example:
+            {
+                "link1": (["email1", ...], ["phone1", ...]),
+                ...
+            }
+        """
+        
+        # Emails, phones and files links are not pages of the business
+        contacts = {}
+        pages_links = []
+        for link in dict.fromkeys(links):
+            if is_page_url(link):
+                pages_links.append(link)
+            else:
+                contacts[link] = ([], [])
+        
+        if self.contact_resolver:
+            contacts.update(self.contact_resolver.resolve(pages_links))
+            return contacts
+        
+        pending_links = []
+        for link in pages_links:
+            cached = self.__get_cached_contact_info__(link)
+            if cached:
+                contacts[link] = cached
+            else:
+                pending_links.append(link)
+        if not pending_links:
+            return contacts
+        
+        # Load many pages at the same time, and read each one when it is ready
+        tab_pool = self.get_tab_pool(TAB_POOL_SIZE)
+        pages = tab_pool.load_pages(
+            pending_links,
+            state=self.__get_ready_state__(),
+            time_out=PAGE_TIMEOUT,
+        )
+        with PROFILER.span("scraper.load_contact_pages"):
+            for link, loaded in pages:
+                emails, phones, anchors, status = self.__read_page_contacts__(link)
+                
+                # Pages not loaded in time are saved as errors, to retry them soon
+                if not loaded:
+                    status = "error"
+                page = (emails, phones, anchors, status)
+                contacts[link] = self.__get_contact_info__(link, page)
+        
+        return contacts
+        
+    @timed("scraper.extract_business_page")
+    def __extract_business_page__(self, results: list = None) -> list:
+        """ Extract businesses from page
+        
+        Args:
+            results (list, optional): name and links of each business, already
+                read from the page html. Defaults to None (read from the browser).
+        
+        Returns:
+            list: businesses data
+            
+            Example:
+            [
+                {
+                    "name": "name",
+                    "links": ["link1", "link2", ...],
+                    "province": "province",
+                    "solution": "solution",
+                    "cnae": "cnae",
+                },
+                ...
+            ]
+        """
+                
+        selectors = {
+            "row": '.views-row',
+            "name": 'h2',
+            "link": 'a'
+        }
+        
+        # Get name and links of all businesses (if not read yet)
+        if results is None:
+            results = self.__get_page_results__(selectors)
+        
+        businesses = []
+        page_data = []
+        page_keys = set()
+        for result in results:
+            
+            name = result["name"]
+            links = result["links"]
+            
+            business_key = self.businesses_index.get_key(name, links)
+            if business_key in self.businesses_index.keys or business_key in page_keys:
+                print(f"\t\t{name} already scraped, skipping...")
+                METRICS.inc("scraper_businesses_skipped_total")
+                
+                # Save the current filters of the business, without visiting it
+                if OUTPUT == "sqlite" and USE_FILTERS:
+                    page_data.append({
+                        "name": name,
+                        "links": ", ".join(self.__clean_list__(links)),
+                        "province": self.province,
+                        "solution": self.solution,
+                        "cnae": self.cnae,
+                        "emails": "",
+                        "phones": "",
+                    })
+                continue
+            page_keys.add(business_key)
+            
+            # Clean duplicates
+            links = self.__clean_list__(links)
+            businesses.append((name, links))
+        
+        # Extract contact info from the links of all businesses
+        page_links = [link for _, links in businesses for link in links]
+        contacts = self.__get_contacts__(page_links)
+        
+        for name, links in businesses:
+            
+            emails, phones = [], []
+            for link in links:
+                new_emails, new_phones = contacts.get(link, ([], []))
+                emails += new_emails
+                phones += new_phones
+            
+            business_data = {
+                "name": name,
+                "links": ", ".join(links),
+                "province": self.province,
+                "solution": self.solution,
+                "cnae": self.cnae,
+                "emails": ", ".join(emails),
+                "phones": ", ".join(phones),
+            }
+            page_data.append(business_data)
+            
+        return page_data
+    
+    def __get_page_results__(self, selectors: dict) -> list:
+        """ Read name and links of all businesses in the current page, in a single js call
+        
+        Args:
+            selectors (dict): css selectors of row, name and link
+        
+        Returns:
+            list: name and links of each business
+        """
+        
+        script = """
+            const [selectorRow, selectorName, selectorLink] = arguments;
+            const rows = document.querySelectorAll(selectorRow);
+            return Array.from(rows, row => {
+                const nameElem = row.querySelector(selectorName);
+                const linkElems = row.querySelectorAll(selectorLink);
+                return {
+                    name: nameElem ? nameElem.innerText.trim() : "",
+                    links: Array.from(linkElems, link => link.href),
+                };
+            });
+        """
+        return self.driver.execute_script(
+            script,
+            selectors["row"],
+            selectors["name"],
+            selectors["link"],
+        )
+    
+    @timed("scraper.get_filters_combinations")
+    def __get_filters_combinations__(self) -> dict:
+        """ Create (if not exist) a json file with all filters combinations
+        
+        Returns:
+            dict: filters combinations with id and name by category
+            
+            Example:
+            [
+                {
+                    "province_id": "id",
+                    "province_name": "name",
+                    "solution_id": "id",
+                    "solution_name": "name",
+                    "cnae_id": "id",
+                    "cnae_name": "name",
+                },
+                ...
+            ]
+        """
+        
+        # Return data if file exists
+        if os.path.exists(self.filters_path):
+            with open(self.filters_path, "r") as file:
+                return json.load(file)
+        
+        # Get only combinations with results
+        if PRUNE_FILTERS:
+            filters_combinations = self.__plan_filters_combinations__()
+            
+        # Get all combinations
+        else:
+            filters = self.__get_filters__()
+            filters_combinations = []
+            filters_provinces = filters["provinces"]
+            filters_solutions = filters["solutions"]
+            filters_cnae = filters["cnae"]
+            
+            # Create combinations
+            for province in filters_provinces:
+                for solution in filters_solutions:
+                    for cnae in filters_cnae:
+                        filters_combinations.append({
+                            "province": province,
+                            "solution": solution,
+                            "cnae": cnae,
+                        })
+        
+        # Save csv file
+        with open(self.filters_path, "w", newline="") as file:
+            json.dump(filters_combinations, file, indent=4)
+            
+        # Return filters
+        return filters_combinations
+    
+    @timed("scraper.go_next_page")
+    def __go_next_page__(self) -> bool:
+        """ Go to next page
+        
+        Returns:
+            bool: True if there is a next page, False otherwise
+        """
+        
+        selector_next = '.pager__item--next a'
+        next_page_elems = self.get_elems(selector_next)
+        if not next_page_elems:
+            return False
+        
+        self.mark_page(".view-content")
+        self.click_js(selector_next)
+        self.wait_page_change()
+        
+        return True
+    
+    @timed("scraper.go_to_page")
+    def __go_to_page__(self, page: int):
+        """ Load a specific page of the current results, with the pager url param
+        
+        Args:
+            page (int): page number, starting in 1
+        """
+        
+        self.set_page(self.__get_page_url__(page))
+        self.wait_ready()
+    
+    def __get_page_url__(self, page: int) -> str:
+        """ Return the url of a page of the current results, with the pager url param
+        
+        Args:
+            page (int): page number, starting in 1
+        
+        Returns:
+            str: url of the page
+        """
+        
+        url_parts = urlparse(self.driver.current_url)
+        query = parse_qs(url_parts.query, keep_blank_values=True)
+        query["page"] = [str(page - 1)]
+        return urlunparse(url_parts._replace(query=urlencode(query, doseq=True)))
+    
+    def __get_pages_urls__(self, start_page: int) -> list:
+        """ Return the urls of the pages of the current results, from the pager links
+        
+        Args:
+            start_page (int): first page number, starting in 1
+        
+        Returns:
+            list: urls of the pages, from start page to the last one,
+                or None if the pager does not show the number of pages
+        """
+        
+        script = """
+            const links = document.querySelectorAll(".pager a[href*='page=']");
+            const next = document.querySelector(".pager__item--next");
+            const last = document.querySelector(".pager__item--last");
+            if (next && !last) {
+                return null;
+            }
+            let lastPage = 0;
+            for (const link of links) {
+                const page = parseInt(new URL(link.href).searchParams.get("page"));
+                if (!isNaN(page)) {
+                    lastPage = Math.max(lastPage, page);
+                }
+            }
+            return lastPage + 1;
+        """
+        pages_count = self.driver.execute_script(script)
+        if pages_count is None:
+            return None
+        
+        return [
+            self.__get_page_url__(page)
+            for page in range(start_page, pages_count + 1)
+        ]
+    
+    @timed("scraper.extract_save_pages_parallel")
+    def __extract_save_pages_parallel__(self, pages_urls: list, start_page: int):
+        """ Download many pages at once with http requests, and extract and save
+            them in order (falling back to the browser if a page fails)
+        
+        Args:
+            pages_urls (list): urls of the pages to extract
+            start_page (int): page number of the first url
+        """
+        
+        # Current page is already loaded in the browser
+        futures = [None] + [
+            self.pages_executor.submit(self.pages_fetcher.get_html, url)
+            for url in pages_urls[1:]
+        ]
+        
+        for index, url in enumerate(pages_urls):
+            page = start_page + index
+            print(f"\tScraping page {page}...")
+            
+            results = None
+            if futures[index]:
+                html = futures[index].result()
+                if html:
+                    results = parse_listing(html, url)
+                else:
+                    print(f"\t\tPage {page} not loaded, using browser...")
+                    METRICS.inc("scraper_errors_total", labels={"stage": "listing_page"})
+                    self.set_page(url)
+                    self.wait_ready()
+                    self.__record_page__(url)
+            page_data = self.__extract_business_page__(results)
+            
+            formatted_data = list(map(
+                lambda business: list(business.values()),
+                page_data
+            ))
+            self.__save_page__({
+                "key": self.task_key,
+                "page": page,
+                "rows": formatted_data,
+            })
+            
+            # Continue in a new browser (the tab pool keeps navigating),
+            # without the downloads of the next pages
+            if index < len(pages_urls) - 1:
+                try:
+                    self.__check_browser__()
+                except BrowserRestartRequired:
+                    for future in futures[index + 1:]:
+                        future.cancel()
+                    raise
+        
+        page = start_page + len(pages_urls) - 1
+        self.__save_page__({"key": self.task_key, "page": page, "rows": [], "done": True})
+    
+    def __check_browser__(self):
+        """ Stop the current task if the browser must be recycled
+            (by navigations or memory)
+        
+        Raises:
+            BrowserRestartRequired: the task continues in a new browser
+        """
+        
+        restart_reason = self.supervisor.check()
+        if restart_reason:
+            raise BrowserRestartRequired(restart_reason)
+    
+    def __get_filter_key__(self, filter: dict) -> str:
+        """ Return a unique key of a filters combination, used in progress journal
+        
+        Args:
+            filter (dict): province, solution and cnae
+            
+        Returns:
+            str: filters key
+        """
+        
+        return f"{filter['province']}|{filter['solution']}|{filter['cnae']}"
+    
+    @timed("scraper.save_page")
+    def __save_page__(self, result: dict):
+        """ Save rows of a page in excel file (or csv stream or sqlite database)
+            and its progress in journal, or send them to the writer process
+        
+        Args:
+            result (dict): rows of the page and progress data
+            
+            Example:
+            {
+                "key": "filters key",
+                "page": 1,
+                "rows": [[...], ...],
+                "done": False,
+            }
+        """
+        
+        # Last page saved of the current task, to continue it after a browser restart
+        if not result.get("done"):
+            self.task_page = result["page"]
+        
+        # Send to writer, keeping a local index to skip these businesses
+        if self.send_results:
+            for row in result["rows"]:
+                self.businesses_index.add(row[0], row[1])
+            result["metrics"] = METRICS.drain_counters()
+            result["worker"] = os.getpid()
+            result["filter"] = {
+                "province": self.province,
+                "solution": self.solution,
+                "cnae": self.cnae,
+            }
+            if PROFILER.enabled:
+                result["profile"] = PROFILER.drain_stats()
+            self.send_results(result)
+            return
+        
+        self.__update_metrics__(result)
+        
+        # Save all rows in database, updating the known businesses
+        if self.results_store:
+            self.__save_rows_store__(result["rows"])
+            self.pending_rows += len(result["rows"])
+            METRICS.inc("scraper_businesses_total", len(result["rows"]))
+            self.pending_progress.append(result)
+            self.__save_progress__()
+            return
+        
+        # Skip businesses already saved (like the ones found by other workers)
+        rows = list(filter(
+            lambda row: self.businesses_index.add(row[0], row[1]),
+            result["rows"]
+        ))
+        self.pending_progress.append(result)
+        self.pending_rows += len(rows)
+        METRICS.inc("scraper_businesses_total", len(rows))
+        
+        # Buffer rows, progress is saved when they are flushed
+        if self.stream:
+            self.stream.write_rows(rows)
+            return
+        
+        if rows:
+            self.sheets.write_data(rows, self.current_row)
+            self.sheets.save()
+            self.current_row += len(rows)
+        self.__save_progress__()
+    
+    def __save_rows_store__(self, rows: list):
+        """ Insert or update rows in the results database, in a single transaction
+        
+        Args:
+            rows (list): rows to save
+        """
+        
+        businesses = []
+        for row in rows:
+            name, links, province, solution, cnae, emails, phones = row
+            self.businesses_index.add(name, links)
+            businesses.append({
+                "key": self.businesses_index.get_key(name, links),
+                "name": name,
+                "links": links or "",
+                "province": province or "",
+                "solution": solution or "",
+                "cnae": cnae or "",
+                "emails": self.__clean_list__((emails or "").split(", ")),
+                "phones": self.__clean_list__((phones or "").split(", ")),
+            })
+        self.results_store.upsert_businesses(businesses)
+    
+    @timed("scraper.save_progress")
+    def __save_progress__(self):
+        """ Save businesses index and journal of the pages already saved in disk
+        """
+        
+        self.businesses_index.save(self.index_path)
+        
+        for result in self.pending_progress:
+            if result.get("done"):
+                self.journal.save_done(result["key"])
+            else:
+                self.journal.save_page(result["key"], result["page"])
+        self.pending_progress = []
+        
+        self.rows_written += self.pending_rows
+        self.pending_rows = 0
+        METRICS.set("scraper_rows_written", self.rows_written)
+    
+    def __update_metrics__(self, result: dict):
+        """ Update the counters of pages and filters with a page saved
+            (and add the counters sent by the worker)
+        
+        Args:
+            result (dict): rows of the page and progress data
+        """
+        
+        METRICS.merge_counters(result.pop("metrics", []))
+        
+        # Times and current filter of the worker
+        profile = result.pop("profile", None)
+        if profile:
+            PROFILER.merge_stats(profile)
+        if "worker" in result:
+            worker = {"worker": str(result.pop("worker"))}
+            METRICS.set_info("scraper_current_filter", {**result.pop("filter"), **worker},
+                             group=worker)
+        
+        if result.get("done"):
+            METRICS.inc("scraper_filters_done_total")
+            self.filters_pending = max(0, self.filters_pending - 1)
+            METRICS.set("scraper_filters_pending", self.filters_pending)
+            return
+        
+        METRICS.inc("scraper_pages_total")
+        METRICS.set("scraper_last_page_timestamp_seconds", time.time())
+    
+    @timed("scraper.export_data")
+    def __export_data__(self):
+        """ Save all rows of the csv stream or the database in the excel file,
+            in a single save
+        """
+        
+        print("Saving data in excel file...")
+        if self.results_store:
+            self.results_store.export_xlsx(self.sheets_path, self.sheet_name, self.header)
+            return
+        
+        self.stream.flush()
+        sheets = self.__open_sheets__()
+        sheets.clear_sheet()
+        sheets.append_rows(self.stream.iter_rows())
+        sheets.save()
+    
+    def __extract_save_data__(self, start_page: int = 1):
+        """ Extract data from all pages and save in excel file
+        
+        Args:
+            start_page (int, optional): page to start (to resume). Defaults to 1.
+        """
+        
+        page = start_page
+        if page > 1:
+            print(f"\tResuming from page {page}...")
+            self.__go_to_page__(page)
+        
+        # Load the next pages at once, if the pager shows the number of pages
+        if self.pages_fetcher:
+            pages_urls = self.__get_pages_urls__(page)
+            if pages_urls:
+                self.__extract_save_pages_parallel__(pages_urls, page)
+                return
+            
+        while True:
+            
+            # Extract businesses from page
+            print(f"\tScraping page {page}...")
+            self.__record_page__(self.__get_page_url__(page) if page > 1 else "")
+            page_data = self.__extract_business_page__()
+            
+            formatted_data = list(map(
+                lambda business: list(business.values()),
+                page_data
+            ))
+            
+            # Save data in excel
+            self.__save_page__({
+                "key": self.task_key,
+                "page": page,
+                "rows": formatted_data,
+            })
+            
+            # Continue in a new browser, if the current one must be recycled
+            self.__check_browser__()
+            
+            # Go next page
+            more_pages = self.__go_next_page__()
+            if not more_pages:
+                break
+            
+            page += 1
+        
+        self.__save_page__({"key": self.task_key, "page": page, "rows": [], "done": True})
+    
+    @timed("scraper.scrape_filter")
+    def __scrape_filter__(self, filter: dict):
+        """ Apply a filters combination and extract its data
+        
+        Args:
+            filter (dict): province, solution, cnae to apply and page to start
+        """
+        
+        # Show filter status
+        status = f"Getting data with filters: {filter['province']}, "
+        status += f"{filter['solution']}, {filter['cnae']}..."
+        print(status)
+        
+        # Save filters
+        self.province = filter["province"]
+        self.solution = filter["solution"]
+        self.cnae = filter["cnae"]
+        self.task_key = self.__get_filter_key__(filter)
+        METRICS.set_info("scraper_current_filter", {
+            "province": self.province,
+            "solution": self.solution,
+            "cnae": self.cnae,
+        })
+        
+        # Apply filters: open results url directly, or click them in home page
+        filter_url = ""
+        if FILTER_NAVIGATION == "url":
+            filter_url = self.__get_filter_url__()
+        if filter_url:
+            self.set_page(filter_url)
+            self.wait_ready()
+            filter_available = True
+        else:
+            self.__load_home_page__()
+            filter_available = self.__set_filter__()
+        if not filter_available:
+            print("\tFilter not available, skipping...")
+            METRICS.inc("scraper_errors_total", labels={"stage": "filter"})
+            self.__save_page__({"key": self.task_key, "page": 0, "rows": [], "done": True})
+            return
+        
+        # Extract data
+        self.__extract_save_data__(filter.get("start_page", 1))
+    
+    def __scrape_all__(self, task: dict):
+        """ Extract data of all businesses, without filters
+        
+        Args:
+            task (dict): page to start
+        """
+        
+        self.task_key = "all"
+        if self.driver.current_url.rstrip("/") != self.home.rstrip("/"):
+            self.__load_home_page__()
+        self.__extract_save_data__(task.get("start_page", 1))
+    
+    def __run_supervised__(self, run_task: callable, task: dict):
+        """ Run a task watching the browser: it is restarted when it must be
+            recycled (by navigations or memory) or when it fails, and the task
+            is put back from the page after the last one saved
+        
+        Args:
+            run_task (callable): function to run the task
+            task (dict): task data, with the page to start
+        """
+        
+        errors = 0
+        while True:
+            self.task_page = task.get("start_page", 1) - 1
+            restart_reason = ""
+            try:
+                run_task(task)
+                return
+            except BrowserRestartRequired as error:
+                restart_reason = str(error)
+            except Exception as error:
+                errors += 1
+                print(f"\tBrowser error: {error}")
+                METRICS.inc("scraper_errors_total", labels={"stage": "browser"})
+            
+            # A failed restart is a task error too (the task fails in the dead browser)
+            try:
+                restart_reason = restart_reason or self.supervisor.check(health=True)
+                self.supervisor.restart(restart_reason or "error")
+            except Exception as error:
+                errors += 1
+                print(f"\tBrowser restart error: {error}")
+                METRICS.inc("scraper_errors_total", labels={"stage": "browser_restart"})
+            
+            if errors > TASK_RETRIES:
+                print("\tToo many errors, task will be resumed in the next run...")
+                return
+            
+            task = {**task, "start_page": self.task_page + 1}
+    
+    def __load_businesses_index__(self, old_data: list):
+        """ Load the index of businesses already scraped from its file,
+            or build it from the saved data if the file is outdated
+        
+        Args:
+            old_data (iterable): rows already saved, with name and links
+        """
+        
+        if self.results_store:
+            self.businesses_index.keys.update(self.results_store.iter_keys())
+            return
+        
+        data_path = self.stream_path if self.stream else self.sheets_path
+        index_updated = os.path.exists(self.index_path) and (
+            not os.path.exists(data_path) or
+            os.path.getmtime(self.index_path) >= os.path.getmtime(data_path)
+        )
+        if index_updated:
+            self.businesses_index.load(self.index_path)
+            return
+        
+        self.__index_rows__(old_data)
+        
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        self.businesses_index.save(self.index_path)
+    
+    def __index_rows__(self, rows: list):
+        """ Add businesses of rows already saved to the businesses index
+        
+        Args:
+            rows (iterable): rows with name and links
+        """
+        
+        for row in rows:
+            if not row:
+                continue
+            links = row[1] if len(row) > 1 else ""
+            self.businesses_index.add(row[0], links or "")
+    
+    def autorun(self):
+        """ Main scraping workflow """
+        
+        # Get current data (copied to the csv stream or database the first time),
+        # only read when the businesses index must be rebuilt
+        print("Getting already scraped data...")
+        if self.stream:
+            if not self.stream.exists():
+                rows = list(self.__iter_sheet_data__()) or [self.header]
+                
+                # Index the rows first: the flush saves the index, newer than the csv
+                self.__index_rows__(rows)
+                self.stream.write_rows(rows)
+                self.stream.flush()
+            old_data = self.stream.iter_rows()
+        elif self.results_store:
+            if not self.results_store.count():
+                rows = self.__iter_sheet_data__(list(range(1, len(self.header) + 1)))
+                rows = filter(lambda row: row[0] and list(row) != self.header, rows)
+                self.__save_rows_store__(list(rows))
+            old_data = []
+        else:
+            
+            # Add header to sheet
+            self.sheets.write_data([self.header])
+            self.current_row = self.sheets.current_sheet.max_row + 1
+            old_data = self.__iter_sheet_data__([1, 2])
+        self.__load_businesses_index__(old_data)
+        
+        # Export metrics while the run is in progress
+        if METRICS_PORT:
+            METRICS.start_server(METRICS_PORT)
+        if METRICS_FILE:
+            METRICS.start_textfile(METRICS_FILE, METRICS_INTERVAL)
+        
+        try:
+            self.__extract_all_data__()
+        finally:
+            
+            # The database is exported on demand (EXPORT_XLSX, or with
+            # "python -m libs.results_store results.db data.xlsx")
+            if self.stream or (self.results_store and EXPORT_XLSX):
+                self.__export_data__()
+            
+            if METRICS_FILE:
+                METRICS.write_textfile(METRICS_FILE)
+            METRICS.stop()
+            
+            # Show the time of each stage
+            if PROFILE:
+                print(f"\n{PROFILER.get_summary()}\n")
+                PROFILER.write_trace(self.trace_path)
+        
+        # Reset progress when the run ends, keeping it if some task was not
+        # finished (too many errors or a worker died), to resume it
+        pending_tasks = [key for key in self.tasks_keys if not self.journal.is_done(key)]
+        if pending_tasks:
+            print(f"{len(pending_tasks)} tasks not finished, resume them in the next run")
+        else:
+            self.journal.clear()
+    
+    def __extract_all_data__(self):
+        """ Extract data with or without filters, skipping the work already done
+        """
+        
+        if USE_FILTERS:
+            print("Getting data with filters...")
+            filters = self.__get_filters_combinations__()
+            
+            # Skip filters already done and resume the last page
+            pending_filters = []
+            for filter in filters:
+                filter_key = self.__get_filter_key__(filter)
+                if self.journal.is_done(filter_key):
+                    continue
+                start_page = self.journal.get_last_page(filter_key) + 1
+                pending_filters.append({**filter, "start_page": start_page})
+            self.tasks_keys = [self.__get_filter_key__(filter) for filter in filters]
+            skipped = len(filters) - len(pending_filters)
+            self.filters_pending = len(pending_filters)
+            METRICS.set("scraper_filters_pending", self.filters_pending)
+            if skipped:
+                print(f"Skipping {skipped} filters already done...")
+            
+            # Save filters urls before starting the workers
+            if FILTER_NAVIGATION == "url":
+                self.__get_facets_params__()
+            
+            if WORKERS > 1:
+                print(f"Starting {WORKERS} workers...")
+                worker_args = (self.businesses_index.keys,)
+                pool = WorkerPool(create_worker, WORKERS, worker_args)
+                pool.run(pending_filters, self.__save_page__)
+            else:
+                for filter in pending_filters:
+                    self.__run_supervised__(self.__scrape_filter__, filter)
+                
+        else:
+            print("Getting data without filters...")
+            self.tasks_keys = ["all"]
+            if not self.journal.is_done("all"):
+                start_page = self.journal.get_last_page("all") + 1
+                self.__run_supervised__(self.__scrape_all__, {"start_page": start_page})
+
+
+def create_worker(send_results: callable, businesses_keys: set) -> callable:
+    """ Create a scraper in a worker process
+    
+    Args:
+        send_results (callable): function to send pages to the writer process
+        businesses_keys (set): keys of the businesses already scraped
+        
+    Returns:
+        callable: function to scrape each filters combination
+    """
+    
+    scraper = Scraper(send_results=send_results)
+    scraper.businesses_index.keys = businesses_keys
+    return partial(scraper.__run_supervised__, scraper.__scrape_filter__)